@@ -6,6 +6,10 @@ from flask_cors import CORS
 from dotenv import load_dotenv
 import os
 from config import Config
+from .services.report_jobs import ReportJobQueue
+from .services.report_cache import ReportCache
+from .json_provider import FastJSONProvider
+from .compression import CompressionMiddleware
 
 # Load environment variables from .env file
 load_dotenv()
@@ -14,6 +18,8 @@ load_dotenv()
 db = SQLAlchemy()
 migrate = Migrate()
 jwt = JWTManager()
+report_jobs = ReportJobQueue()
+report_cache = ReportCache()
 
 def create_app(config_class=None):
     if config_class is None:
@@ -27,11 +33,22 @@ def create_app(config_class=None):
     
     # Load config based on environment
     app.config.from_object(config_class)
+    app.json = FastJSONProvider(app)
     
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
+    report_jobs.init_app(app)
+    report_cache.init_app(app)
+
+    if app.config.get('COMPRESSION_ENABLED', True):
+        app.wsgi_app = CompressionMiddleware(
+            app.wsgi_app,
+            min_size=app.config.get('COMPRESSION_MIN_SIZE', 500),
+            level=app.config.get('COMPRESSION_LEVEL', 6),
+            brotli_quality=app.config.get('COMPRESSION_BROTLI_QUALITY', 4)
+        )
 
     development_mode = config_class.DEVELOPMENT == True
     
@@ -44,6 +61,8 @@ def create_app(config_class=None):
     with app.app_context():
         # Import models to ensure they are registered with SQLAlchemy
         from . import models
+        # Nasłuch zapisów aktualizujący dzienne agregaty
+        from .services import rollups
         
         # Create tables if they don't exist (useful for development)
         if development_mode:
@@ -58,6 +77,8 @@ def create_app(config_class=None):
         from .routes.revenues import revenues_bp
         from .routes.schedules import schedules_bp
         from .routes.reports import reports_bp
+        from .routes.search import search_bp
+        from .routes.batch import batch_bp
         
         app.register_blueprint(auth_bp, url_prefix='/api/auth')
         app.register_blueprint(users_bp, url_prefix='/api/users')
@@ -67,5 +88,10 @@ def create_app(config_class=None):
         app.register_blueprint(revenues_bp, url_prefix='/api/revenues')
         app.register_blueprint(schedules_bp, url_prefix='/api/schedules')
         app.register_blueprint(reports_bp, url_prefix='/api/reports')
+        app.register_blueprint(search_bp, url_prefix='/api/search')
+        app.register_blueprint(batch_bp, url_prefix='/api/batch')
+
+        from .commands import rollups_cli
+        app.cli.add_command(rollups_cli)
     
     return app
@@ -0,0 +1,13 @@
+import click
+from flask.cli import AppGroup
+from . import db
+from .services import rollups
+
+rollups_cli = AppGroup('rollups', help='Dzienne agregaty kosztów, przychodów i godzin.')
+
+@rollups_cli.command('rebuild')
+def rebuild_rollups():
+    """Przelicz tabele agregatów od zera."""
+    rollups.rebuild(db.session.connection())
+    db.session.commit()
+    click.echo('Przeliczono dzienne agregaty')
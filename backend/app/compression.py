@@ -0,0 +1,154 @@
+import zlib
+from werkzeug.datastructures import Headers
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli jest opcjonalny
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+COMPRESSIBLE_MIMETYPES = (
+    'text/',
+    'application/json',
+    'application/x-ndjson',
+    'application/javascript',
+    'application/xml'
+)
+
+
+class _GzipCompressor:
+    def __init__(self, level):
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data, flush=True):
+        # Z_SYNC_FLUSH - klient dostaje dane na bieżąco przy odpowiedziach strumieniowych
+        if not flush:
+            return self.compressor.compress(data)
+        return self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self.compressor.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self, quality):
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data, flush=True):
+        if not flush:
+            return self.compressor.process(data)
+        return self.compressor.process(data) + self.compressor.flush()
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+class CompressionMiddleware:
+    # Middleware WSGI kompresujące odpowiedzi (gzip, brotli jeśli dostępny), także strumieniowe
+
+    def __init__(self, wsgi_app, min_size=500, level=6, brotli_quality=4):
+        self.wsgi_app = wsgi_app
+        self.min_size = min_size
+        self.level = level
+        self.brotli_quality = brotli_quality
+
+    def negotiate(self, accept_encoding):
+        accepted = parse_accept_header(accept_encoding)
+        if brotli is not None and accepted['br'] > 0:
+            return 'br'
+        if accepted['gzip'] > 0:
+            return 'gzip'
+        return None
+
+    def compressor(self, encoding):
+        if encoding == 'br':
+            return _BrotliCompressor(self.brotli_quality)
+        return _GzipCompressor(self.level)
+
+    def should_compress(self, environ, status, headers):
+        if environ.get('REQUEST_METHOD') == 'HEAD':
+            return False
+        if not status.startswith('2') or status.startswith('204'):
+            return False
+        if 'Content-Encoding' in headers:
+            return False
+        content_length = headers.get('Content-Length', type=int)
+        if content_length is not None and content_length < self.min_size:
+            return False
+        mimetype = headers.get('Content-Type', '')
+        return any(mimetype.startswith(prefix) for prefix in COMPRESSIBLE_MIMETYPES)
+
+    def __call__(self, environ, start_response):
+        encoding = self.negotiate(environ.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return self.wsgi_app(environ, start_response)
+
+        state = {}
+
+        def capture_start_response(status, headers, exc_info=None):
+            state['status'] = status
+            state['headers'] = headers
+            state['exc_info'] = exc_info
+
+        app_iter = self.wsgi_app(environ, capture_start_response)
+        return self._respond(environ, app_iter, encoding, state, start_response)
+
+    def _respond(self, environ, app_iter, encoding, state, start_response):
+        try:
+            iterator = iter(app_iter)
+            # Aplikacja może wywołać start_response dopiero przy pierwszym fragmencie
+            buffered = []
+            if 'status' not in state:
+                for chunk in iterator:
+                    buffered.append(chunk)
+                    break
+
+            status = state['status']
+            headers = Headers(state['headers'])
+
+            if not self.should_compress(environ, status, headers):
+                start_response(status, state['headers'], state['exc_info'])
+                yield from buffered
+                yield from iterator
+                return
+
+            # Zbierz dane do progu minimalnego rozmiaru - małych odpowiedzi nie kompresujemy
+            size = sum(len(chunk) for chunk in buffered)
+            if size < self.min_size:
+                for chunk in iterator:
+                    buffered.append(chunk)
+                    size += len(chunk)
+                    if size >= self.min_size:
+                        break
+                else:
+                    start_response(status, state['headers'], state['exc_info'])
+                    yield b''.join(buffered)
+                    return
+
+            # Odpowiedź z Content-Length jest już w całości w pamięci; bez niego - strumieniowa
+            streamed = 'Content-Length' not in headers
+            headers.remove('Content-Length')
+            headers['Content-Encoding'] = encoding
+            headers.add('Vary', 'Accept-Encoding')
+            compressor = self.compressor(encoding)
+
+            if not streamed:
+                # Jeden blok kompresji - opróżnianie po każdym fragmencie tylko pogarsza stopień kompresji
+                body = compressor.compress(b''.join([*buffered, *iterator]), flush=False) + compressor.finish()
+                headers['Content-Length'] = str(len(body))
+                start_response(status, headers.to_wsgi_list(), state['exc_info'])
+                yield body
+                return
+
+            start_response(status, headers.to_wsgi_list(), state['exc_info'])
+            yield compressor.compress(b''.join(buffered))
+            for chunk in iterator:
+                if chunk:
+                    yield compressor.compress(chunk)
+            yield compressor.finish()
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
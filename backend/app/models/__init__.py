@@ -2,6 +2,8 @@ from .user import User
 from .employee import Employee, EmployeeCost, EmployeeRevenue
 from .workplace import Workplace, WorkplaceAssignment, WorkplaceCost, WorkplaceRevenue
 from .schedule import Schedule
+from .rollup import EmployeeDailyRollup, WorkplaceDailyRollup
+from .data_version import DataVersion
 
 __all__ = [
     'User',
@@ -12,5 +14,8 @@ __all__ = [
     'WorkplaceAssignment',
     'WorkplaceCost',
     'WorkplaceRevenue',
-    'Schedule'
+    'Schedule',
+    'EmployeeDailyRollup',
+    'WorkplaceDailyRollup',
+    'DataVersion'
 ] 
\ No newline at end of file
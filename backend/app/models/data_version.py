@@ -0,0 +1,13 @@
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import UUID
+from .. import db
+
+class DataVersion(db.Model):
+    __tablename__ = 'data_versions'
+
+    manager_id = db.Column(UUID(as_uuid=True), db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<DataVersion {self.manager_id} - {self.version}>'
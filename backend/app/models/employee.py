@@ -4,9 +4,14 @@ import uuid
 
 class Employee(db.Model):
     __tablename__ = 'employees'
+    __table_args__ = (
+        db.Index('ix_employees_first_name_trgm', 'first_name', postgresql_using='gin', postgresql_ops={'first_name': 'gin_trgm_ops'}),
+        db.Index('ix_employees_last_name_trgm', 'last_name', postgresql_using='gin', postgresql_ops={'last_name': 'gin_trgm_ops'}),
+        db.Index('ix_employees_email_trgm', 'email', postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}),
+    )
 
     id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    manager_id = db.Column(db.UUID(as_uuid=True), db.ForeignKey('users.id'), nullable=False)
+    manager_id = db.Column(db.UUID(as_uuid=True), db.ForeignKey('users.id'), nullable=False, index=True)
     email = db.Column(db.String(120), unique=True, nullable=False)
     first_name = db.Column(db.String(50), nullable=False)
     last_name = db.Column(db.String(50), nullable=False)
@@ -24,6 +29,10 @@ class Employee(db.Model):
 
 class EmployeeCost(db.Model):
     __tablename__ = 'employee_costs'
+    __table_args__ = (
+        db.Index('ix_employee_costs_employee_id_date', 'employee_id', 'date'),
+        db.Index('ix_employee_costs_description_trgm', 'description', postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}),
+    )
 
     id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     employee_id = db.Column(db.UUID(as_uuid=True), db.ForeignKey('employees.id'), nullable=False)
@@ -38,6 +47,10 @@ class EmployeeCost(db.Model):
 
 class EmployeeRevenue(db.Model):
     __tablename__ = 'employee_revenues'
+    __table_args__ = (
+        db.Index('ix_employee_revenues_employee_id_date', 'employee_id', 'date'),
+        db.Index('ix_employee_revenues_description_trgm', 'description', postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}),
+    )
 
     id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     employee_id = db.Column(db.UUID(as_uuid=True), db.ForeignKey('employees.id'), nullable=False)
@@ -0,0 +1,38 @@
+from sqlalchemy.dialects.postgresql import UUID
+from .. import db
+
+class EmployeeDailyRollup(db.Model):
+    __tablename__ = 'employee_daily_rollups'
+    __table_args__ = (
+        # Limit 24h na pracownika i dzień egzekwowany przez bazę - tolerancja na zaokrąglenia float;
+        # dni przekraczające limit sprzed jego wprowadzenia nie mogą przekroczyć swojej dawnej sumy
+        db.CheckConstraint('hours <= GREATEST(24.0001, legacy_hours)', name='ck_employee_daily_rollups_hours_cap'),
+    )
+
+    employee_id = db.Column(UUID(as_uuid=True), db.ForeignKey('employees.id', ondelete='CASCADE'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    costs = db.Column(db.Float, nullable=False, default=0)
+    revenues = db.Column(db.Float, nullable=False, default=0)
+    hours = db.Column(db.Float, nullable=False, default=0)
+    cost_count = db.Column(db.Integer, nullable=False, default=0)
+    revenue_count = db.Column(db.Integer, nullable=False, default=0)
+    schedule_count = db.Column(db.Integer, nullable=False, default=0)
+    legacy_hours = db.Column(db.Float)
+
+    def __repr__(self):
+        return f'<EmployeeDailyRollup {self.employee_id} - {self.day}>'
+
+class WorkplaceDailyRollup(db.Model):
+    __tablename__ = 'workplace_daily_rollups'
+
+    workplace_id = db.Column(UUID(as_uuid=True), db.ForeignKey('workplaces.id', ondelete='CASCADE'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    costs = db.Column(db.Float, nullable=False, default=0)
+    revenues = db.Column(db.Float, nullable=False, default=0)
+    hours = db.Column(db.Float, nullable=False, default=0)
+    cost_count = db.Column(db.Integer, nullable=False, default=0)
+    revenue_count = db.Column(db.Integer, nullable=False, default=0)
+    schedule_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<WorkplaceDailyRollup {self.workplace_id} - {self.day}>'
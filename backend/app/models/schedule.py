@@ -5,6 +5,10 @@ from .. import db
 
 class Schedule(db.Model):
     __tablename__ = 'schedules'
+    __table_args__ = (
+        db.Index('ix_schedules_employee_id_date', 'employee_id', 'date'),
+        db.Index('ix_schedules_workplace_id_date', 'workplace_id', 'date'),
+    )
 
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     workplace_id = db.Column(UUID(as_uuid=True), db.ForeignKey('workplaces.id'), nullable=False)
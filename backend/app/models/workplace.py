@@ -4,9 +4,13 @@ import uuid
 
 class Workplace(db.Model):
     __tablename__ = 'workplaces'
+    __table_args__ = (
+        db.Index('ix_workplaces_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        db.Index('ix_workplaces_location_trgm', 'location', postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'}),
+    )
 
     id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    manager_id = db.Column(db.UUID(as_uuid=True), db.ForeignKey('users.id'), nullable=False)
+    manager_id = db.Column(db.UUID(as_uuid=True), db.ForeignKey('users.id'), nullable=False, index=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
     location = db.Column(db.String(200))
@@ -24,6 +28,10 @@ class Workplace(db.Model):
 
 class WorkplaceAssignment(db.Model):
     __tablename__ = 'workplace_assignments'
+    __table_args__ = (
+        db.Index('ix_workplace_assignments_workplace_id_date', 'workplace_id', 'date'),
+        db.Index('ix_workplace_assignments_employee_id_date', 'employee_id', 'date'),
+    )
 
     id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     workplace_id = db.Column(db.UUID(as_uuid=True), db.ForeignKey('workplaces.id'), nullable=False)
@@ -37,6 +45,10 @@ class WorkplaceAssignment(db.Model):
 
 class WorkplaceCost(db.Model):
     __tablename__ = 'workplace_costs'
+    __table_args__ = (
+        db.Index('ix_workplace_costs_workplace_id_date', 'workplace_id', 'date'),
+        db.Index('ix_workplace_costs_description_trgm', 'description', postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}),
+    )
 
     id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     workplace_id = db.Column(db.UUID(as_uuid=True), db.ForeignKey('workplaces.id'), nullable=False)
@@ -51,6 +63,10 @@ class WorkplaceCost(db.Model):
 
 class WorkplaceRevenue(db.Model):
     __tablename__ = 'workplace_revenues'
+    __table_args__ = (
+        db.Index('ix_workplace_revenues_workplace_id_date', 'workplace_id', 'date'),
+        db.Index('ix_workplace_revenues_description_trgm', 'description', postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}),
+    )
 
     id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     workplace_id = db.Column(db.UUID(as_uuid=True), db.ForeignKey('workplaces.id'), nullable=True)
@@ -0,0 +1,28 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from ..services.batch import parse_batch, run_batch
+from ..services.fields import parse_flag
+from ..services.versioning import track_changes
+
+batch_bp = Blueprint('batch', __name__)
+batch_bp.after_request(track_changes)
+
+@batch_bp.route('', methods=['POST'])
+@jwt_required()
+def batch():
+    data = request.get_json(silent=True) or {}
+    
+    try:
+        items = parse_batch(data)
+        atomic = parse_flag(data, 'atomic', True)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Żądania składowe uwierzytelniane tym samym tokenem
+    headers = {'Authorization': request.headers.get('Authorization', '')}
+    results, rolled_back = run_batch(items, headers, atomic=atomic)
+    
+    return jsonify({
+        'results': results,
+        'rolled_back': rolled_back
+    }), 400 if rolled_back else 200
@@ -1,47 +1,54 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from datetime import date
-from sqlalchemy import func
+from sqlalchemy import select
 from .. import db
 from ..models import Employee, EmployeeCost, EmployeeRevenue
+from ..services.aggregates import employee_monthly_totals, month_start
+from ..services.fields import parse_fields
+from ..services.versioning import not_modified, track_changes
+
+EMPLOYEE_COLUMNS = ('id', 'first_name', 'last_name', 'email', 'phone')
+EMPLOYEE_FIELDS = EMPLOYEE_COLUMNS + ('monthly_costs', 'monthly_revenues')
 
 employees_bp = Blueprint('employees', __name__)
+employees_bp.before_request(not_modified)
+employees_bp.after_request(track_changes)
 
 @employees_bp.route('', methods=['GET'])
 @jwt_required()
 def get_employees():
     manager_id = get_jwt_identity()
-    employees = Employee.query.filter_by(manager_id=manager_id).all()
-
-    today = date.today()
-    first_day = date(today.year, today.month, 1)
     
-    employee_stats = {}
-    for emp in employees:
-        costs = db.session.query(func.sum(EmployeeCost.amount)).filter(
-            EmployeeCost.employee_id == emp.id,
-            func.date_trunc('month', EmployeeCost.date) == first_day
-        ).scalar() or 0
+    try:
+        first_day = month_start(request.args.get('month'))
+        fields = parse_fields(request.args.get('fields'), EMPLOYEE_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Projekcja tylko żądanych kolumn zamiast pełnych obiektów
+    columns = [Employee.id] + [
+        getattr(Employee, field) for field in fields if field in EMPLOYEE_COLUMNS
+    ]
+    employees = db.session.execute(
+        select(*columns).where(Employee.manager_id == manager_id)
+    ).all()
 
-        revenues = db.session.query(func.sum(EmployeeRevenue.amount)).filter(
-            EmployeeRevenue.employee_id == emp.id,
-            func.date_trunc('month', EmployeeRevenue.date) == first_day
-        ).scalar() or 0
-
-        employee_stats[emp.id] = {
-            'monthly_costs': float(costs),
-            'monthly_revenues': float(revenues)
-        }
+    # Sumy miesięczne liczone tylko, gdy są potrzebne
+    monthly = {}
+    if 'monthly_costs' in fields or 'monthly_revenues' in fields:
+        monthly = employee_monthly_totals(manager_id, first_day)
     
-    return jsonify([{
-        'id': emp.id,
-        'first_name': emp.first_name,
-        'last_name': emp.last_name,
-        'email': emp.email,
-        'phone': emp.phone,
-        'monthly_costs': employee_stats[emp.id]['monthly_costs'],
-        'monthly_revenues': employee_stats[emp.id]['monthly_revenues']
-    } for emp in employees])
+    result = []
+    for emp in employees:
+        item = {field: getattr(emp, field) for field in fields if field in EMPLOYEE_COLUMNS}
+        costs, revenues = monthly.get(emp.id, (0.0, 0.0))
+        if 'monthly_costs' in fields:
+            item['monthly_costs'] = costs
+        if 'monthly_revenues' in fields:
+            item['monthly_revenues'] = revenues
+        result.append(item)
+    
+    return jsonify(result)
 
 @employees_bp.route('', methods=['POST'])
 @jwt_required()
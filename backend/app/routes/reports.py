@@ -1,182 +1,285 @@
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify, Response, send_file, stream_with_context, url_for
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from datetime import datetime
-from sqlalchemy import func
-from .. import db
-from ..models import Workplace, Employee, Schedule, WorkplaceCost, WorkplaceRevenue, EmployeeCost, EmployeeRevenue
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
-import tempfile
-import os
+from datetime import datetime, timedelta
+from ..services.aggregates import (
+    employee_totals_query, workplace_totals_query, employee_report_query, workplace_report_query,
+    SERIES_BUCKETS, bucket_starts, series_query, comparison_query, as_day
+)
+from ..services.report_pipeline import report_sections
+from .. import db, report_jobs, report_cache
+from ..models import User
+from ..services.report_jobs import ReportJobQueueFull
+from ..services.ledger_export import EXPORT_DATASETS, EXPORT_FORMATS, iter_export
+from ..services.excel_export import ExcelReportWriter, XLSX_MIMETYPE, buffer_size, iter_buffer
+import time
 
 reports_bp = Blueprint('reports', __name__)
 
 def format_currency(value):
     return f"{value:,.2f} zł"
 
-def setup_header_style(cell):
-    cell.font = Font(bold=True, color="FFFFFF")
-    cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    cell.alignment = Alignment(horizontal="center", vertical="center")
-    cell.border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
+def parse_stats_params(data):
+    return {
+        'start_date': datetime.fromisoformat(data.get('start_date').replace('Z', '+00:00')),
+        'end_date': datetime.fromisoformat(data.get('end_date').replace('Z', '+00:00')),
+        'report_type': data.get('type', 'all')
+    }
 
-@reports_bp.route('/stats', methods=['POST'])
-@jwt_required()
-def get_statistics():
-    try:
-        data = request.get_json()
-        start_date = datetime.fromisoformat(data.get('start_date').replace('Z', '+00:00'))
-        end_date = datetime.fromisoformat(data.get('end_date').replace('Z', '+00:00'))
-        report_type = data.get('type', 'all')
-        
-        manager_id = get_jwt_identity()
-        
-        employees = Employee.query.filter_by(manager_id=manager_id).all()
-        workplaces = Workplace.query.filter_by(manager_id=manager_id).all()
+def parse_comparison_params(data):
+    params = parse_stats_params(data)
+    params['compare_start_date'] = datetime.fromisoformat(data.get('compare_start_date').replace('Z', '+00:00'))
+    params['compare_end_date'] = datetime.fromisoformat(data.get('compare_end_date').replace('Z', '+00:00'))
+    return params
 
-        employee_stats = []
-        if report_type in ['employee', 'all']:
-            for employee in employees:
-                costs = EmployeeCost.query.filter(
-                    EmployeeCost.employee_id == employee.id,
-                    EmployeeCost.date.between(start_date, end_date)
-                ).all()
-                total_costs = sum(cost.amount for cost in costs)
-
-                revenues = EmployeeRevenue.query.filter(
-                    EmployeeRevenue.employee_id == employee.id,
-                    EmployeeRevenue.date.between(start_date, end_date)
-                ).all()
-                total_revenues = sum(revenue.amount for revenue in revenues)
-
-                schedules = Schedule.query.filter(
-                    Schedule.employee_id == employee.id,
-                    Schedule.date.between(start_date, end_date)
-                ).all()
-                total_hours = sum(schedule.hours for schedule in schedules)
+def parse_series_params(data):
+    params = parse_stats_params(data)
+    params.pop('report_type')
+    params['entity'] = data.get('entity', 'employee')
+    params['bucket'] = data.get('bucket', 'month')
+    if params['entity'] not in ('employee', 'workplace'):
+        raise ValueError('Nieprawidłowy typ encji')
+    if params['bucket'] not in SERIES_BUCKETS:
+        raise ValueError('Nieprawidłowy przedział czasu')
+    return params
+
+def parse_excel_params(data):
+    return {
+        'start_date': datetime.strptime(data['start_date'], '%Y-%m-%d').date(),
+        'end_date': datetime.strptime(data['end_date'], '%Y-%m-%d').date(),
+        'report_type': data.get('type', 'all')
+    }
 
+def build_statistics(manager_id, start_date, end_date, report_type='all'):
+    include_employees = report_type in ['employee', 'all']
+    include_workplaces = report_type in ['workplace', 'all']
+
+    # Sekcje liczone równolegle na osobnych połączeniach
+    statements = []
+    if include_employees:
+        statements.append(employee_totals_query(manager_id, start_date, end_date))
+    if include_workplaces:
+        statements.append(workplace_totals_query(manager_id, start_date, end_date))
+    with report_sections(statements) as sections:
+        employee_stats = []
+        if include_employees:
+            for row in next(sections):
+                total_costs = float(row.total_costs)
+                total_revenues = float(row.total_revenues)
                 employee_stats.append({
-                    'name': f'{employee.first_name} {employee.last_name}',
+                    'name': f'{row.first_name} {row.last_name}',
                     'total_costs': total_costs,
                     'total_revenues': total_revenues,
                     'total_profit': total_revenues - total_costs,
-                    'total_hours': total_hours
+                    'total_hours': float(row.total_hours)
                 })
-        
-        workplace_stats = []
-        if report_type in ['workplace', 'all']:
-            for workplace in workplaces:
-                costs = WorkplaceCost.query.filter(
-                    WorkplaceCost.workplace_id == workplace.id,
-                    WorkplaceCost.date.between(start_date, end_date)
-                ).all()
-                total_costs = sum(cost.amount for cost in costs)
-
-                revenues = WorkplaceRevenue.query.filter(
-                    WorkplaceRevenue.workplace_id == workplace.id,
-                    WorkplaceRevenue.date.between(start_date, end_date)
-                ).all()
-                total_revenues = sum(revenue.amount for revenue in revenues)
 
+        workplace_stats = []
+        if include_workplaces:
+            for row in next(sections):
+                total_costs = float(row.total_costs)
+                total_revenues = float(row.total_revenues)
                 workplace_stats.append({
-                    'name': f'{workplace.name}',
+                    'name': f'{row.name}',
                     'total_costs': total_costs,
                     'total_revenues': total_revenues,
                     'total_profit': total_revenues - total_costs
                 })
-        
-        return jsonify({
-            'employees': employee_stats,
-            'workplaces': workplace_stats
-        }), 200
 
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    return {
+        'employees': employee_stats,
+        'workplaces': workplace_stats
+    }
 
-@reports_bp.route('/excel', methods=['POST'])
+def compare_totals(row, fields):
+    base = {}
+    comparison = {}
+    for field in fields:
+        base[f'total_{field}'] = float(getattr(row, f'base_{field}'))
+        comparison[f'total_{field}'] = float(getattr(row, f'compare_{field}'))
+    base['total_profit'] = base['total_revenues'] - base['total_costs']
+    comparison['total_profit'] = comparison['total_revenues'] - comparison['total_costs']
+
+    delta = {}
+    delta_pct = {}
+    for key in base:
+        delta[key] = base[key] - comparison[key]
+        delta_pct[key] = delta[key] / abs(comparison[key]) * 100 if comparison[key] else None
+
+    return {
+        'base': base,
+        'comparison': comparison,
+        'delta': delta,
+        'delta_pct': delta_pct
+    }
+
+def build_comparison(manager_id, start_date, end_date, compare_start_date, compare_end_date, report_type='all'):
+    include_employees = report_type in ['employee', 'all']
+    include_workplaces = report_type in ['workplace', 'all']
+    base_range = (start_date, end_date)
+    compare_range = (compare_start_date, compare_end_date)
+
+    statements = []
+    if include_employees:
+        statements.append(comparison_query('employee', manager_id, base_range, compare_range))
+    if include_workplaces:
+        statements.append(comparison_query('workplace', manager_id, base_range, compare_range))
+    with report_sections(statements) as sections:
+        employee_stats = []
+        if include_employees:
+            for row in next(sections):
+                employee_stats.append({
+                    'name': f'{row.first_name} {row.last_name}',
+                    **compare_totals(row, ('costs', 'revenues', 'hours'))
+                })
+
+        workplace_stats = []
+        if include_workplaces:
+            for row in next(sections):
+                workplace_stats.append({
+                    'name': f'{row.name}',
+                    **compare_totals(row, ('costs', 'revenues'))
+                })
+
+    return {
+        'base_range': {'start_date': start_date.isoformat(), 'end_date': end_date.isoformat()},
+        'comparison_range': {'start_date': compare_start_date.isoformat(), 'end_date': compare_end_date.isoformat()},
+        'employees': employee_stats,
+        'workplaces': workplace_stats
+    }
+
+MAX_SERIES_BUCKETS = 1000
+
+def build_series(manager_id, start_date, end_date, entity='employee', bucket='month'):
+    starts = bucket_starts(start_date, end_date, bucket)
+    if len(starts) > MAX_SERIES_BUCKETS:
+        raise ValueError('Zbyt wiele przedziałów czasu, wybierz większy przedział')
+    positions = {start: index for index, start in enumerate(starts)}
+
+    # Dane kolumnowe: jedna tablica wartości na encję i miarę
+    series = []
+    current = None
+    for row in db.session.execute(series_query(entity, manager_id, start_date, end_date, bucket)):
+        if current is None or current['id'] != row.id:
+            name = f'{row.first_name} {row.last_name}' if entity == 'employee' else row.name
+            current = {
+                'id': row.id,
+                'name': name,
+                'costs': [0.0] * len(starts),
+                'revenues': [0.0] * len(starts),
+                'profit': [0.0] * len(starts),
+                'hours': [0.0] * len(starts)
+            }
+            series.append(current)
+
+        if row.bucket is None:
+            continue
+        index = positions[as_day(row.bucket)]
+        costs = float(row.costs)
+        revenues = float(row.revenues)
+        current['costs'][index] = costs
+        current['revenues'][index] = revenues
+        current['profit'][index] = revenues - costs
+        current['hours'][index] = float(row.hours)
+
+    return {
+        'entity': entity,
+        'bucket': bucket,
+        'buckets': [start.isoformat() for start in starts],
+        'series': series
+    }
+
+@reports_bp.route('/series', methods=['POST'])
 @jwt_required()
-def generate_excel_report():
-    user_id = get_jwt_identity()
-    data = request.get_json()
+def get_series():
+    manager_id = get_jwt_identity()
 
     try:
-        start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date()
-        end_date = datetime.strptime(data['end_date'], '%Y-%m-%d').date()
-        report_type = data.get('type', 'all')
-    except (KeyError, ValueError):
-        return jsonify({'error': 'Nieprawidłowy format dat'}), 400
+        params = parse_series_params(request.get_json())
+        series = report_cache.get_or_compute(
+            manager_id, 'series', params, lambda: build_series(manager_id, **params)
+        )
+    except (AttributeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
 
-    # Tworzenie pliku Excel
-    wb = Workbook()
-    
+    return jsonify(series), 200
+
+@reports_bp.route('/stats', methods=['POST'])
+@jwt_required()
+def get_statistics():
     try:
-        if report_type in ['workplace', 'all']:
-            ws_workplaces = wb.active
-            ws_workplaces.title = "Miejsca pracy"
-            
-            headers_workplaces = [
+        data = request.get_json()
+        manager_id = get_jwt_identity()
+
+        # Tryb porównania dwóch okresów
+        if data.get('compare_start_date') and data.get('compare_end_date'):
+            params = parse_comparison_params(data)
+            stats = report_cache.get_or_compute(
+                manager_id, 'comparison', params, lambda: build_comparison(manager_id, **params)
+            )
+            return jsonify(stats), 200
+
+        params = parse_stats_params(data)
+        stats = report_cache.get_or_compute(
+            manager_id, 'stats', params, lambda: build_statistics(manager_id, **params)
+        )
+        return jsonify(stats), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def workplace_sheet_rows(rows):
+    for row in rows:
+        costs = float(row.total_costs)
+        revenues = float(row.total_revenues)
+        yield [
+            row.name,
+            row.employee_count,
+            format_currency(costs),
+            format_currency(revenues),
+            format_currency(revenues - costs)
+        ]
+
+def employee_sheet_rows(rows):
+    for row in rows:
+        costs = float(row.total_costs)
+        direct_revenues = float(row.total_revenues)
+        # Przychody miejsc pracy nie są przypisane do pracowników w modelu danych
+        workplace_revenues = 0.0
+        total_revenues = workplace_revenues + direct_revenues
+        yield [
+            f"{row.first_name} {row.last_name}",
+            row.workplace_names or '-',
+            format_currency(costs),
+            format_currency(workplace_revenues),
+            format_currency(direct_revenues),
+            format_currency(total_revenues),
+            format_currency(total_revenues - costs)
+        ]
+
+def build_excel_report(manager_id, start_date, end_date, report_type='all'):
+    include_workplaces = report_type in ['workplace', 'all']
+    include_employees = report_type in ['employee', 'all']
+
+    # Zapytania obu arkuszy startują od razu; arkusz renderowany jest w trakcie pobierania kolejnego
+    statements = []
+    if include_workplaces:
+        statements.append(workplace_report_query(manager_id, start_date, end_date))
+    if include_employees:
+        statements.append(employee_report_query(manager_id, start_date, end_date))
+    with report_sections(statements) as sections:
+        writer = ExcelReportWriter()
+
+        if include_workplaces:
+            writer.add_sheet("Miejsca pracy", [
                 "Miejsce pracy",
                 "Liczba pracowników",
                 "Koszty",
                 "Przychody",
                 "Zysk"
-            ]
-            
-            for col, header in enumerate(headers_workplaces, 1):
-                cell = ws_workplaces.cell(row=1, column=col, value=header)
-                setup_header_style(cell)
-                ws_workplaces.column_dimensions[get_column_letter(col)].width = 15
-
-            workplaces = Workplace.query.filter_by(owner_id=user_id).all()
-            row = 2
-            
-            for workplace in workplaces:
-                # Znajdź pracowników, którzy mają koszty lub przychody w tym miejscu pracy
-                employees_with_activity = db.session.query(Employee)\
-                    .join(WorkplaceRevenue, WorkplaceRevenue.employee_id == Employee.id, isouter=True)\
-                    .filter(
-                        WorkplaceRevenue.workplace_id == workplace.id,
-                        WorkplaceRevenue.date.between(start_date, end_date)
-                    )\
-                    .distinct()\
-                    .all()
-
-                employee_count = len(employees_with_activity)
-
-                # Oblicz koszty miejsca pracy
-                costs = db.session.query(func.sum(WorkplaceCost.amount))\
-                    .filter(
-                        WorkplaceCost.workplace_id == workplace.id,
-                        WorkplaceCost.date.between(start_date, end_date)
-                    ).scalar() or 0
-
-                # Oblicz przychody miejsca pracy
-                revenues = db.session.query(func.sum(WorkplaceRevenue.amount))\
-                    .filter(
-                        WorkplaceRevenue.workplace_id == workplace.id,
-                        WorkplaceRevenue.date.between(start_date, end_date)
-                    ).scalar() or 0
-
-                ws_workplaces.cell(row=row, column=1, value=workplace.name)
-                ws_workplaces.cell(row=row, column=2, value=employee_count)
-                ws_workplaces.cell(row=row, column=3, value=format_currency(float(costs)))
-                ws_workplaces.cell(row=row, column=4, value=format_currency(float(revenues)))
-                ws_workplaces.cell(row=row, column=5, value=format_currency(float(revenues - costs)))
-                row += 1
-
-        if report_type in ['employee', 'all']:
-            # Generowanie arkusza dla pracowników
-            ws_employees = wb.create_sheet("Pracownicy") if report_type == 'all' else wb.active
-            if report_type == 'employee':
-                ws_employees.title = "Pracownicy"
-            
-            headers_employees = [
+            ], 15, workplace_sheet_rows(next(sections)))
+
+        if include_employees:
+            writer.add_sheet("Pracownicy", [
                 "Pracownik",
                 "Miejsce pracy",
                 "Koszty",
@@ -184,85 +287,141 @@ def generate_excel_report():
                 "Przychody bezpośrednie",
                 "Łączne przychody",
                 "Zysk"
-            ]
-            
-            for col, header in enumerate(headers_employees, 1):
-                cell = ws_employees.cell(row=1, column=col, value=header)
-                setup_header_style(cell)
-                ws_employees.column_dimensions[get_column_letter(col)].width = 20
-
-            employees = Employee.query\
-                .filter_by(user_id=user_id)\
-                .all()
-
-            row = 2
-            for employee in employees:
-                # Oblicz koszty pracownika
-                costs = db.session.query(func.sum(EmployeeCost.amount))\
-                    .filter(
-                        EmployeeCost.employee_id == employee.id,
-                        EmployeeCost.date.between(start_date, end_date)
-                    ).scalar() or 0
-
-                # Oblicz przychody pracownika z miejsc pracy
-                workplace_revenues = db.session.query(func.sum(WorkplaceRevenue.amount))\
-                    .filter(
-                        WorkplaceRevenue.employee_id == employee.id,
-                        WorkplaceRevenue.date.between(start_date, end_date)
-                    ).scalar() or 0
-
-                # Oblicz bezpośrednie przychody pracownika
-                direct_revenues = db.session.query(func.sum(EmployeeRevenue.amount))\
-                    .filter(
-                        EmployeeRevenue.employee_id == employee.id,
-                        EmployeeRevenue.date.between(start_date, end_date)
-                    ).scalar() or 0
-
-                # Pobierz miejsca pracy pracownika
-                workplaces = db.session.query(Workplace)\
-                    .join(WorkplaceRevenue, WorkplaceRevenue.workplace_id == Workplace.id)\
-                    .filter(
-                        WorkplaceRevenue.employee_id == employee.id,
-                        WorkplaceRevenue.date.between(start_date, end_date)
-                    )\
-                    .distinct()\
-                    .all()
-
-                workplace_names = ', '.join(wp.name for wp in workplaces) if workplaces else '-'
-                total_revenues = workplace_revenues + direct_revenues
-
-                ws_employees.cell(row=row, column=1, value=f"{employee.first_name} {employee.last_name}")
-                ws_employees.cell(row=row, column=2, value=workplace_names)
-                ws_employees.cell(row=row, column=3, value=format_currency(float(costs)))
-                ws_employees.cell(row=row, column=4, value=format_currency(float(workplace_revenues)))
-                ws_employees.cell(row=row, column=5, value=format_currency(float(direct_revenues)))
-                ws_employees.cell(row=row, column=6, value=format_currency(float(total_revenues)))
-                ws_employees.cell(row=row, column=7, value=format_currency(float(total_revenues - costs)))
-                row += 1
-
-        # Zapisz do pliku tymczasowego
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')
-        wb.save(temp_file.name)
-        temp_file.close()
-
-        # Wyślij plik
-        return send_file(
-            temp_file.name,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            as_attachment=True,
-            download_name=f'raport_{start_date}_{end_date}.xlsx'
-        )
+            ], 20, employee_sheet_rows(next(sections)))
+
+    return writer.save()
 
+def excel_response(buffer, start_date, end_date, started_at=None):
+    headers = {
+        'Content-Disposition': f'attachment; filename=raport_{start_date}_{end_date}.xlsx',
+        'Content-Length': str(buffer_size(buffer))
+    }
+    if started_at is not None:
+        # Czas generowania raportu (do pomiaru czasu do pierwszego bajtu)
+        headers['Server-Timing'] = f'report;dur={(time.perf_counter() - started_at) * 1000:.1f}'
+
+    return Response(iter_buffer(buffer), mimetype=XLSX_MIMETYPE, headers=headers)
+
+@reports_bp.route('/excel', methods=['POST'])
+@jwt_required()
+def generate_excel_report():
+    user_id = get_jwt_identity()
+    data = request.get_json()
+
+    try:
+        params = parse_excel_params(data)
+    except (KeyError, ValueError):
+        return jsonify({'error': 'Nieprawidłowy format dat'}), 400
+
+    started_at = time.perf_counter()
+    try:
+        buffer = build_excel_report(user_id, **params)
     except Exception as e:
-        # W przypadku błędu, upewnij się że plik tymczasowy zostanie usunięty
-        if 'temp_file' in locals():
-            os.unlink(temp_file.name)
         return jsonify({'error': 'Wystąpił błąd podczas generowania raportu Excel'}), 500
 
-    finally:
-        # Zawsze próbuj wyczyścić plik tymczasowy
-        if 'temp_file' in locals():
-            try:
-                os.unlink(temp_file.name)
-            except:
-                pass 
+    return excel_response(buffer, params['start_date'], params['end_date'], started_at)
+
+@reports_bp.route('/export', methods=['GET'])
+@jwt_required()
+def export_ledger():
+    manager_id = get_jwt_identity()
+
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': 'Nieprawidłowy format eksportu'}), 400
+
+    dataset = request.args.get('dataset')
+    if dataset not in EXPORT_DATASETS:
+        return jsonify({'error': 'Nieprawidłowy zbiór danych'}), 400
+
+    try:
+        start_date = datetime.strptime(request.args['start_date'], '%Y-%m-%d')
+        end_date = datetime.strptime(request.args['end_date'], '%Y-%m-%d')
+    except (KeyError, ValueError):
+        return jsonify({'error': 'Nieprawidłowy format dat'}), 400
+
+    # Zakres dat włącznie z ostatnim dniem
+    rows = iter_export(export_format, dataset, manager_id, start_date, end_date + timedelta(days=1))
+
+    return Response(
+        stream_with_context(rows),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={
+            'Content-Disposition': f'attachment; filename={dataset}_{start_date.date()}_{end_date.date()}.{export_format}'
+        }
+    )
+
+REPORT_JOB_KINDS = {
+    'stats': (parse_stats_params, build_statistics),
+    'excel': (parse_excel_params, build_excel_report)
+}
+
+def report_job_payload(job):
+    payload = job.to_dict()
+    payload['status_url'] = url_for('reports.get_report_job', id=job.id)
+    if job.status == 'done':
+        payload['download_url'] = url_for('reports.download_report_job', id=job.id)
+    return payload
+
+@reports_bp.route('/jobs', methods=['POST'])
+@jwt_required()
+def create_report_job():
+    manager_id = get_jwt_identity()
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Nieprawidłowe dane żądania'}), 400
+
+    kind = data.get('kind', 'excel')
+    if kind not in REPORT_JOB_KINDS:
+        return jsonify({'error': 'Nieprawidłowy rodzaj raportu'}), 400
+
+    parse_params, body = REPORT_JOB_KINDS[kind]
+    try:
+        params = parse_params(data)
+    except (AttributeError, KeyError, ValueError):
+        return jsonify({'error': 'Nieprawidłowy format dat'}), 400
+
+    try:
+        job = report_jobs.submit(manager_id, kind, body, params)
+    except ReportJobQueueFull:
+        return jsonify({'error': 'Zbyt wiele raportów w kolejce, spróbuj ponownie później'}), 503
+
+    return jsonify(report_job_payload(job)), 202
+
+@reports_bp.route('/jobs/<uuid:id>', methods=['GET'])
+@jwt_required()
+def get_report_job(id):
+    job = report_jobs.get(get_jwt_identity(), id)
+    if job is None:
+        return jsonify({'error': 'Nie znaleziono zadania'}), 404
+
+    return jsonify(report_job_payload(job))
+
+@reports_bp.route('/jobs/<uuid:id>/download', methods=['GET'])
+@jwt_required()
+def download_report_job(id):
+    job = report_jobs.get(get_jwt_identity(), id)
+    if job is None:
+        return jsonify({'error': 'Nie znaleziono zadania'}), 404
+    if job.status != 'done':
+        return jsonify({'error': 'Raport nie jest jeszcze gotowy', 'status': job.status}), 409
+
+    if job.kind == 'stats':
+        return jsonify(job.result)
+
+    return send_file(
+        job.file_path,
+        mimetype=XLSX_MIMETYPE,
+        as_attachment=True,
+        download_name=f"raport_{job.params['start_date']}_{job.params['end_date']}.xlsx"
+    )
+
+@reports_bp.route('/cache', methods=['GET'])
+@jwt_required()
+def get_cache_stats():
+    # Statystyki cache obejmują wszystkich managerów - tylko dla administratora
+    user = db.session.get(User, get_jwt_identity())
+    if user is None or user.role != 'admin':
+        return jsonify({'error': 'Brak uprawnień'}), 403
+
+    return jsonify(report_cache.stats())
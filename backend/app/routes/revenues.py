@@ -2,57 +2,40 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 from sqlalchemy import func
+from sqlalchemy.exc import DataError, IntegrityError
 from .. import db
 from ..models import WorkplaceRevenue, EmployeeRevenue, Workplace, Employee, WorkplaceAssignment
+from ..services.ledger import (
+    LEDGER_FIELDS, bulk_delete_ledger, bulk_update_ledger, ledger_page, parse_bulk_filters, parse_ledger_filters,
+    parse_ledger_patch
+)
+from ..services.fields import parse_fields
+from ..services.ledger_import import import_format, import_ledger, read_rows
+from ..services.versioning import not_modified, track_changes
 
 revenues_bp = Blueprint('revenues', __name__)
+revenues_bp.before_request(not_modified)
+revenues_bp.after_request(track_changes)
 
 @revenues_bp.route('', methods=['GET'])
 @jwt_required()
 def get_revenues():
     manager_id = get_jwt_identity()
     
-    workplace_revenues = db.session.query(WorkplaceRevenue).join(
-        Workplace, WorkplaceRevenue.workplace_id == Workplace.id
-    ).filter(
-        Workplace.manager_id == manager_id
-    ).all()
-    
-    employee_revenues = db.session.query(EmployeeRevenue).join(
-        Employee, EmployeeRevenue.employee_id == Employee.id
-    ).filter(
-        Employee.manager_id == manager_id
-    ).all()
-    
-    revenues = []
-    
-    for cost in workplace_revenues:
-        revenues.append({
-            'id': cost.id,
-            'type': 'workplace',
-            'workplace_id': cost.workplace_id,
-            'workplace_name': cost.workplace.name,
-            'description': cost.description,
-            'amount': float(cost.amount),
-            'date': cost.date.isoformat(),
-            'created_at': cost.created_at.isoformat()
-        })
-    
-    for cost in employee_revenues:
-        revenues.append({
-            'id': cost.id,
-            'type': 'employee',
-            'employee_id': cost.employee_id,
-            'employee_name': f"{cost.employee.first_name} {cost.employee.last_name}",
-            'description': cost.description,
-            'amount': float(cost.amount),
-            'date': cost.date.isoformat(),
-            'created_at': cost.created_at.isoformat()
-        })
-    
-    revenues.sort(key=lambda x: x['date'], reverse=True)
+    try:
+        page = ledger_page(
+            'revenues',
+            manager_id,
+            cursor=request.args.get('after'),
+            limit=request.args.get('limit', type=int),
+            fields=parse_fields(request.args.get('fields'), LEDGER_FIELDS),
+            filters=parse_ledger_filters(request.args),
+            sort=request.args.get('sort')
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    return jsonify(revenues)
+    return jsonify(page)
 
 @revenues_bp.route('', methods=['POST'])
 @jwt_required()
@@ -184,3 +167,69 @@ def delete_revenue(type, id):
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 400 
+
+@revenues_bp.route('/import', methods=['POST'])
+@jwt_required()
+def import_revenues():
+    manager_id = get_jwt_identity()
+    
+    upload = request.files.get('file')
+    if upload is None:
+        return jsonify({'error': 'Brak pliku'}), 400
+    
+    try:
+        rows = read_rows(upload.stream, import_format(upload.filename))
+        result = import_ledger(
+            'revenues',
+            manager_id,
+            rows,
+            skip_invalid=request.args.get('skip_invalid', 'false').lower() == 'true'
+        )
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+    except (DataError, IntegrityError):
+        # Wartość poza zakresem kolumny lub encja usunięta w trakcie importu
+        db.session.rollback()
+        return jsonify({'error': 'Nie udało się zapisać importu, plik nie został zaimportowany'}), 400
+    
+    if result['error_count'] and not result['imported']:
+        return jsonify(result), 400
+    return jsonify(result), 201
+
+@revenues_bp.route('/bulk', methods=['PATCH'])
+@jwt_required()
+def bulk_update_revenues():
+    manager_id = get_jwt_identity()
+    data = request.get_json() or {}
+    
+    try:
+        updated = bulk_update_ledger(
+            'revenues',
+            manager_id,
+            parse_bulk_filters(data.get('filter')),
+            parse_ledger_patch(data.get('patch'))
+        )
+    except (TypeError, ValueError) as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+    except DataError:
+        # Wartość poza zakresem typu kolumny, np. data przesunięta poza obsługiwany zakres
+        db.session.rollback()
+        return jsonify({'error': 'Zmiana daje wartości spoza dopuszczalnego zakresu'}), 400
+    
+    return jsonify({'updated': updated})
+
+@revenues_bp.route('/bulk', methods=['DELETE'])
+@jwt_required()
+def bulk_delete_revenues():
+    manager_id = get_jwt_identity()
+    data = request.get_json() or {}
+    
+    try:
+        deleted = bulk_delete_ledger('revenues', manager_id, parse_bulk_filters(data.get('filter')))
+    except (TypeError, ValueError) as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({'deleted': deleted})
@@ -1,33 +1,47 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from datetime import datetime
-from sqlalchemy import func
+from datetime import date, datetime
 from .. import db
 from ..models import Schedule, Workplace, Employee
+from ..services.schedules import (
+    MAX_BULK_ENTRIES, MAX_DAILY_HOURS, SCHEDULE_FIELDS, bulk_create_schedules, clone_schedules, daily_hours,
+    daily_hours_cap, schedule_page
+)
+from ..services.fields import parse_fields, parse_flag
+from ..services.versioning import not_modified, track_changes
+import uuid
 
 schedules_bp = Blueprint('schedules', __name__)
+schedules_bp.before_request(not_modified)
+schedules_bp.after_request(track_changes)
+
+def parse_arg(name, parser):
+    value = request.args.get(name)
+    return parser(value) if value else None
 
 @schedules_bp.route('', methods=['GET'])
 @jwt_required()
 def get_schedules():
     manager_id = get_jwt_identity()
     
-    schedules = Schedule.query.join(Workplace).filter(Workplace.manager_id == manager_id).all()
-    
-    result = []
-    for schedule in schedules:
-        result.append({
-            'id': str(schedule.id),
-            'workplace_id': str(schedule.workplace_id),
-            'workplace_name': schedule.workplace.name,
-            'employee_id': str(schedule.employee_id),
-            'employee_name': f"{schedule.employee.first_name} {schedule.employee.last_name}",
-            'date': schedule.date.isoformat(),
-            'hours': schedule.hours,
-            'created_at': schedule.created_at.isoformat()
-        })
+    try:
+        filters = {
+            'start': parse_arg('start', date.fromisoformat),
+            'end': parse_arg('end', date.fromisoformat),
+            'employee_id': parse_arg('employee_id', uuid.UUID),
+            'workplace_id': parse_arg('workplace_id', uuid.UUID)
+        }
+        page = schedule_page(
+            manager_id,
+            filters,
+            cursor=request.args.get('after'),
+            limit=request.args.get('limit', type=int),
+            fields=parse_fields(request.args.get('fields'), SCHEDULE_FIELDS)
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    return jsonify(result)
+    return jsonify(page)
 
 @schedules_bp.route('', methods=['POST'])
 @jwt_required()
@@ -53,15 +67,11 @@ def create_schedule():
         if hours <= 0 or hours > 24:
             return jsonify({'error': 'Nieprawidłowa liczba godzin'}), 400
 
-        # Sprawdź łączną liczbę godzin pracownika w danym dniu
-        total_hours = db.session.query(func.sum(Schedule.hours))\
-            .filter(
-                Schedule.employee_id == employee.id,
-                Schedule.date == schedule_date
-            ).scalar() or 0
+        # Sprawdź łączną liczbę godzin pracownika w danym dniu (wiersz agregatu dziennego)
+        total_hours = daily_hours(employee.id, schedule_date)
 
         # Sprawdź czy łączna liczba godzin nie przekracza 24
-        if total_hours + hours > 24:
+        if total_hours + hours > MAX_DAILY_HOURS:
             return jsonify({'error': 'Łączna liczba godzin w danym dniu nie może przekraczać 24'}), 400
 
         # Utwórz nowy grafik
@@ -73,7 +83,9 @@ def create_schedule():
         )
 
         db.session.add(schedule)
-        db.session.commit()
+        # Ograniczenie w bazie chroni limit przy równoległych zapisach
+        with daily_hours_cap():
+            db.session.commit()
 
         return jsonify({
             'id': str(schedule.id),
@@ -91,6 +103,77 @@ def create_schedule():
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
 
+@schedules_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def bulk_create():
+    manager_id = get_jwt_identity()
+    data = request.get_json() or {}
+
+    entries = data.get('entries')
+    if not isinstance(entries, list) or not entries:
+        return jsonify({'error': 'Brak wpisów grafiku'}), 400
+    if len(entries) > MAX_BULK_ENTRIES:
+        return jsonify({'error': f'Maksymalna liczba wpisów to {MAX_BULK_ENTRIES}'}), 400
+
+    try:
+        atomic = parse_flag(data, 'atomic', True)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        created, errors = bulk_create_schedules(manager_id, entries, atomic=atomic)
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+
+    result = {
+        'created': [
+            {
+                'id': values['id'],
+                'workplace_id': values['workplace_id'],
+                'employee_id': values['employee_id'],
+                'date': values['date'],
+                'hours': values['hours']
+            }
+            for values in created
+        ],
+        'errors': errors
+    }
+    return jsonify(result), 201 if created else 400
+
+@schedules_bp.route('/clone', methods=['POST'])
+@jwt_required()
+def clone():
+    manager_id = get_jwt_identity()
+    data = request.get_json() or {}
+
+    try:
+        filters = {
+            # str() - identyfikator podany jako liczba lub obiekt to błąd danych (400), a nie wyjątek uuid
+            'employee_id': uuid.UUID(str(data['employee_id'])) if data.get('employee_id') else None,
+            'workplace_id': uuid.UUID(str(data['workplace_id'])) if data.get('workplace_id') else None
+        }
+        created, conflicts = clone_schedules(
+            manager_id,
+            date.fromisoformat(data['source_start']),
+            date.fromisoformat(data['source_end']),
+            date.fromisoformat(data['target_start']),
+            filters
+        )
+    except KeyError as e:
+        return jsonify({'error': f'Brak wymaganego pola: {str(e)}'}), 400
+    except (TypeError, ValueError) as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+
+    if conflicts:
+        return jsonify({
+            'error': f'Łączna liczba godzin w dniu nie może przekraczać {MAX_DAILY_HOURS}',
+            'conflicts': conflicts
+        }), 400
+
+    return jsonify({'created': created}), 201
+
 @schedules_bp.route('/<uuid:id>', methods=['PUT'])
 @jwt_required()
 def update_schedule(id):
@@ -122,14 +205,12 @@ def update_schedule(id):
 
         # Sprawdź całkowitą liczbę godzin dla pracownika w danym dniu
         date = datetime.strptime(data['date'], '%Y-%m-%d').date()
-        total_hours = db.session.query(func.sum(Schedule.hours)).filter(
-            Schedule.employee_id == employee.id,
-            Schedule.date == date,
-            Schedule.id != id  # Wykluczamy aktualnie edytowany grafik
-        ).scalar() or 0
+        total_hours = daily_hours(employee.id, date)
+        if schedule.employee_id == employee.id and schedule.date == date:
+            total_hours -= schedule.hours  # Wykluczamy aktualnie edytowany grafik
 
         # Sprawdź czy suma godzin nie przekracza 24
-        if total_hours + hours > 24:
+        if total_hours + hours > MAX_DAILY_HOURS:
             return jsonify({'error': f'Całkowita liczba godzin w dniu {data["date"]} nie może przekroczyć 24 (obecnie zaplanowane: {total_hours}h)'}), 400
 
         # Aktualizuj grafik
@@ -138,7 +219,8 @@ def update_schedule(id):
         schedule.date = date
         schedule.hours = hours
 
-        db.session.commit()
+        with daily_hours_cap():
+            db.session.commit()
 
         return jsonify({
             'id': str(schedule.id),
@@ -0,0 +1,26 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from ..services.fields import parse_fields
+from ..services.search import SEARCH_TYPES, search
+from ..services.versioning import not_modified, track_changes
+
+search_bp = Blueprint('search', __name__)
+search_bp.before_request(not_modified)
+search_bp.after_request(track_changes)
+
+@search_bp.route('', methods=['GET'])
+@jwt_required()
+def search_all():
+    manager_id = get_jwt_identity()
+    
+    try:
+        results = search(
+            manager_id,
+            request.args.get('q'),
+            types=parse_fields(request.args.get('types'), SEARCH_TYPES),
+            limit=request.args.get('limit', type=int)
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({'results': results})
@@ -1,46 +1,55 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import func
-from datetime import date, datetime
+from sqlalchemy import select
+from datetime import datetime
 from .. import db
 from ..models import Workplace, WorkplaceAssignment, WorkplaceCost, WorkplaceRevenue, Employee
+from ..services.aggregates import workplace_monthly_totals, month_start
+from ..services.fields import parse_fields
+from ..services.versioning import not_modified, track_changes
+
+WORKPLACE_COLUMNS = ('id', 'name', 'location', 'description')
+WORKPLACE_FIELDS = WORKPLACE_COLUMNS + ('monthly_costs', 'monthly_revenues')
 
 workplaces_bp = Blueprint('workplaces', __name__)
+workplaces_bp.before_request(not_modified)
+workplaces_bp.after_request(track_changes)
 
 @workplaces_bp.route('', methods=['GET'])
 @jwt_required()
 def get_workplaces():
     manager_id = get_jwt_identity()
-    workplaces = Workplace.query.filter_by(manager_id=manager_id).all()
-    
-    today = date.today()
-    first_day = date(today.year, today.month, 1)
     
-    workplace_stats = {}
+    try:
+        first_day = month_start(request.args.get('month'))
+        fields = parse_fields(request.args.get('fields'), WORKPLACE_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Projekcja tylko żądanych kolumn zamiast pełnych obiektów
+    columns = [Workplace.id] + [
+        getattr(Workplace, field) for field in fields if field in WORKPLACE_COLUMNS
+    ]
+    workplaces = db.session.execute(
+        select(*columns).where(Workplace.manager_id == manager_id)
+    ).all()
+    
+    # Sumy miesięczne liczone tylko, gdy są potrzebne
+    monthly = {}
+    if 'monthly_costs' in fields or 'monthly_revenues' in fields:
+        monthly = workplace_monthly_totals(manager_id, first_day)
+    
+    result = []
     for wp in workplaces:
-        costs = db.session.query(func.sum(WorkplaceCost.amount)).filter(
-            WorkplaceCost.workplace_id == wp.id,
-            func.date_trunc('month', WorkplaceCost.date) == first_day
-        ).scalar() or 0
-        
-        revenues = db.session.query(func.sum(WorkplaceRevenue.amount)).filter(
-            WorkplaceRevenue.workplace_id == wp.id,
-            func.date_trunc('month', WorkplaceRevenue.date) == first_day
-        ).scalar() or 0
-        
-        workplace_stats[wp.id] = {
-            'monthly_costs': float(costs),
-            'monthly_revenues': float(revenues)
-        }
-    
-    return jsonify([{
-        'id': wp.id,
-        'name': wp.name,
-        'location': wp.location,
-        'description': wp.description,
-        'monthly_costs': workplace_stats[wp.id]['monthly_costs'],
-        'monthly_revenues': workplace_stats[wp.id]['monthly_revenues']
-    } for wp in workplaces])
+        item = {field: getattr(wp, field) for field in fields if field in WORKPLACE_COLUMNS}
+        costs, revenues = monthly.get(wp.id, (0.0, 0.0))
+        if 'monthly_costs' in fields:
+            item['monthly_costs'] = costs
+        if 'monthly_revenues' in fields:
+            item['monthly_revenues'] = revenues
+        result.append(item)
+    
+    return jsonify(result)
 
 @workplaces_bp.route('', methods=['POST'])
 @jwt_required()
@@ -0,0 +1 @@
+# Warstwa usług współdzielona przez blueprinty (agregacje, eksporty raportów)
@@ -0,0 +1,275 @@
+from datetime import date, datetime, timedelta
+from sqlalchemy import case, func, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from .. import db
+from ..models import Employee, Schedule, Workplace, EmployeeDailyRollup, WorkplaceDailyRollup
+
+
+def as_day(value):
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _rollup_sums(rollup_model, key_column, owned_ids, start_date, end_date):
+    # Jedno zapytanie GROUP BY na dziennych agregatach, ograniczone do encji danego managera
+    return select(
+        key_column.label('entity_id'),
+        func.sum(rollup_model.costs).label('costs'),
+        func.sum(rollup_model.revenues).label('revenues'),
+        func.sum(rollup_model.hours).label('hours')
+    ).where(
+        key_column.in_(owned_ids),
+        rollup_model.day.between(as_day(start_date), as_day(end_date))
+    ).group_by(key_column).subquery()
+
+
+def _owned_employee_ids(manager_id):
+    return select(Employee.id).where(Employee.manager_id == manager_id).scalar_subquery()
+
+
+def _owned_workplace_ids(manager_id):
+    return select(Workplace.id).where(Workplace.manager_id == manager_id).scalar_subquery()
+
+
+def employee_totals_query(manager_id, start_date, end_date):
+    sums = _rollup_sums(EmployeeDailyRollup, EmployeeDailyRollup.employee_id,
+                        _owned_employee_ids(manager_id), start_date, end_date)
+
+    # LEFT JOIN, żeby pracownicy bez aktywności również trafili do wyniku
+    return select(
+        Employee.id,
+        Employee.first_name,
+        Employee.last_name,
+        func.coalesce(sums.c.costs, 0).label('total_costs'),
+        func.coalesce(sums.c.revenues, 0).label('total_revenues'),
+        func.coalesce(sums.c.hours, 0).label('total_hours')
+    ).outerjoin(
+        sums, sums.c.entity_id == Employee.id
+    ).where(
+        Employee.manager_id == manager_id
+    ).order_by(Employee.last_name, Employee.first_name, Employee.id)
+
+
+def workplace_totals_query(manager_id, start_date, end_date):
+    sums = _rollup_sums(WorkplaceDailyRollup, WorkplaceDailyRollup.workplace_id,
+                        _owned_workplace_ids(manager_id), start_date, end_date)
+
+    return select(
+        Workplace.id,
+        Workplace.name,
+        func.coalesce(sums.c.costs, 0).label('total_costs'),
+        func.coalesce(sums.c.revenues, 0).label('total_revenues')
+    ).outerjoin(
+        sums, sums.c.entity_id == Workplace.id
+    ).where(
+        Workplace.manager_id == manager_id
+    ).order_by(Workplace.name, Workplace.id)
+
+
+def month_start(value=None):
+    # Pierwszy dzień miesiąca z parametru 'RRRR-MM' lub bieżącego miesiąca
+    if not value:
+        today = date.today()
+        return date(today.year, today.month, 1)
+    return datetime.strptime(value, '%Y-%m').date()
+
+
+def monthly_totals(rollup_model, key_column, owned_ids, month_start):
+    # Koszty i przychody w miesiącu dla wszystkich encji jednym zapytaniem
+    next_month = (month_start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    rows = db.session.execute(
+        select(
+            key_column,
+            func.sum(rollup_model.costs),
+            func.sum(rollup_model.revenues)
+        ).where(
+            key_column.in_(owned_ids),
+            rollup_model.day >= month_start,
+            rollup_model.day < next_month
+        ).group_by(key_column)
+    ).all()
+    return {entity_id: (float(costs), float(revenues)) for entity_id, costs, revenues in rows}
+
+
+def employee_monthly_totals(manager_id, month_start):
+    return monthly_totals(EmployeeDailyRollup, EmployeeDailyRollup.employee_id,
+                          _owned_employee_ids(manager_id), month_start)
+
+
+def workplace_monthly_totals(manager_id, month_start):
+    return monthly_totals(WorkplaceDailyRollup, WorkplaceDailyRollup.workplace_id,
+                          _owned_workplace_ids(manager_id), month_start)
+
+
+def workplace_report_query(manager_id, start_date, end_date):
+    owned_ids = _owned_workplace_ids(manager_id)
+    totals = workplace_totals_query(manager_id, start_date, end_date).subquery()
+
+    # Liczba pracowników zaplanowanych w miejscu pracy w danym okresie
+    staff = select(
+        Schedule.workplace_id.label('entity_id'),
+        func.count(Schedule.employee_id.distinct()).label('total')
+    ).where(
+        Schedule.workplace_id.in_(owned_ids),
+        Schedule.date.between(start_date, end_date)
+    ).group_by(Schedule.workplace_id).subquery()
+
+    return select(
+        totals.c.name,
+        func.coalesce(staff.c.total, 0).label('employee_count'),
+        totals.c.total_costs,
+        totals.c.total_revenues
+    ).outerjoin(
+        staff, staff.c.entity_id == totals.c.id
+    ).order_by(totals.c.name, totals.c.id)
+
+
+def employee_report_query(manager_id, start_date, end_date):
+    owned_ids = _owned_employee_ids(manager_id)
+    totals = employee_totals_query(manager_id, start_date, end_date).subquery()
+
+    # Miejsca pracy pracownika na podstawie grafiku w danym okresie
+    workplaces = select(
+        Schedule.employee_id.label('entity_id'),
+        func.string_agg(
+            Workplace.name.distinct(),
+            aggregate_order_by(literal_column("', '"), Workplace.name)
+        ).label('names')
+    ).join(
+        Workplace, Schedule.workplace_id == Workplace.id
+    ).where(
+        Schedule.employee_id.in_(owned_ids),
+        Schedule.date.between(start_date, end_date)
+    ).group_by(Schedule.employee_id).subquery()
+
+    return select(
+        totals.c.first_name,
+        totals.c.last_name,
+        workplaces.c.names.label('workplace_names'),
+        totals.c.total_costs,
+        totals.c.total_revenues
+    ).outerjoin(
+        workplaces, workplaces.c.entity_id == totals.c.id
+    ).order_by(totals.c.last_name, totals.c.first_name, totals.c.id)
+
+
+SERIES_BUCKETS = ('day', 'week', 'month')
+
+
+def bucket_start(day, bucket):
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday())
+    if bucket == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(day, bucket):
+    if bucket == 'week':
+        return day + timedelta(days=7)
+    if bucket == 'month':
+        return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return day + timedelta(days=1)
+
+
+def bucket_starts(start_date, end_date, bucket):
+    current = bucket_start(as_day(start_date), bucket)
+    end_date = as_day(end_date)
+    starts = []
+    while current <= end_date:
+        starts.append(current)
+        current = next_bucket(current, bucket)
+    return starts
+
+
+def series_query(entity, manager_id, start_date, end_date, bucket):
+    # Jedno zapytanie date_trunc + GROUP BY po dziennych agregatach
+    if entity == 'employee':
+        rollup_model, key_column, owned_ids = \
+            EmployeeDailyRollup, EmployeeDailyRollup.employee_id, _owned_employee_ids(manager_id)
+        name_columns = [Employee.first_name, Employee.last_name]
+        entity_model = Employee
+    else:
+        rollup_model, key_column, owned_ids = \
+            WorkplaceDailyRollup, WorkplaceDailyRollup.workplace_id, _owned_workplace_ids(manager_id)
+        name_columns = [Workplace.name]
+        entity_model = Workplace
+
+    bucket_column = func.date_trunc(bucket, rollup_model.day)
+    sums = select(
+        key_column.label('entity_id'),
+        bucket_column.label('bucket'),
+        func.sum(rollup_model.costs).label('costs'),
+        func.sum(rollup_model.revenues).label('revenues'),
+        func.sum(rollup_model.hours).label('hours')
+    ).where(
+        key_column.in_(owned_ids),
+        rollup_model.day.between(as_day(start_date), as_day(end_date))
+    ).group_by(key_column, bucket_column).subquery()
+
+    return select(
+        entity_model.id,
+        *name_columns,
+        sums.c.bucket,
+        sums.c.costs,
+        sums.c.revenues,
+        sums.c.hours
+    ).outerjoin(
+        sums, sums.c.entity_id == entity_model.id
+    ).where(
+        entity_model.manager_id == manager_id
+    ).order_by(*name_columns, entity_model.id, sums.c.bucket)
+
+
+def comparison_query(entity, manager_id, base_range, compare_range):
+    # Oba okresy w jednym przebiegu: SUM(CASE WHEN dzień w okresie ...) dla każdej miary
+    if entity == 'employee':
+        rollup_model, key_column, owned_ids = \
+            EmployeeDailyRollup, EmployeeDailyRollup.employee_id, _owned_employee_ids(manager_id)
+        entity_model, name_columns = Employee, [Employee.first_name, Employee.last_name]
+    else:
+        rollup_model, key_column, owned_ids = \
+            WorkplaceDailyRollup, WorkplaceDailyRollup.workplace_id, _owned_workplace_ids(manager_id)
+        entity_model, name_columns = Workplace, [Workplace.name]
+
+    in_base = rollup_model.day.between(as_day(base_range[0]), as_day(base_range[1]))
+    in_compare = rollup_model.day.between(as_day(compare_range[0]), as_day(compare_range[1]))
+
+    columns = []
+    for prefix, condition in (('base', in_base), ('compare', in_compare)):
+        for field in ('costs', 'revenues', 'hours'):
+            columns.append(
+                func.sum(case((condition, getattr(rollup_model, field)), else_=0)).label(f'{prefix}_{field}')
+            )
+
+    sums = select(
+        key_column.label('entity_id'),
+        *columns
+    ).where(
+        key_column.in_(owned_ids),
+        or_(in_base, in_compare)
+    ).group_by(key_column).subquery()
+
+    return select(
+        entity_model.id,
+        *name_columns,
+        *[func.coalesce(sums.c[column.name], 0).label(column.name) for column in columns]
+    ).outerjoin(
+        sums, sums.c.entity_id == entity_model.id
+    ).where(
+        entity_model.manager_id == manager_id
+    ).order_by(*name_columns, entity_model.id)
+
+
+def employee_totals(manager_id, start_date, end_date):
+    return db.session.execute(employee_totals_query(manager_id, start_date, end_date)).all()
+
+
+def workplace_totals(manager_id, start_date, end_date):
+    return db.session.execute(workplace_totals_query(manager_id, start_date, end_date)).all()
+
+
+def stream_rows(stmt, yield_per=500):
+    # Kursor po stronie serwera - wiersze pobierane partiami, bez materializacji całego wyniku
+    return db.session.execute(stmt.execution_options(yield_per=yield_per))
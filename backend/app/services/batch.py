@@ -0,0 +1,115 @@
+from contextlib import contextmanager
+from flask import current_app, g, request
+from flask_sqlalchemy.query import Query
+from sqlalchemy.orm import Session
+from werkzeug.test import EnvironBuilder
+from .. import db
+
+MAX_BATCH_REQUESTS = 100
+BATCH_METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+
+# Raporty liczą sekcje w wątkach roboczych na osobnych sesjach - nie widziałyby niezatwierdzonych
+# zapisów paczki, więc nie mogą być jej częścią
+EXCLUDED_PREFIXES = ('/api/batch', '/api/reports')
+
+
+class InvalidBatch(ValueError):
+    pass
+
+
+def parse_batch(data):
+    requests = data.get('requests') if isinstance(data, dict) else None
+    if not isinstance(requests, list) or not requests:
+        raise InvalidBatch('Brak żądań w paczce')
+    if len(requests) > MAX_BATCH_REQUESTS:
+        raise InvalidBatch(f'Maksymalna liczba żądań w paczce to {MAX_BATCH_REQUESTS}')
+
+    parsed = []
+    for index, item in enumerate(requests):
+        if not isinstance(item, dict):
+            raise InvalidBatch(f'Nieprawidłowe żądanie nr {index}')
+        method = str(item.get('method', 'GET')).upper()
+        path = item.get('path')
+        if method not in BATCH_METHODS:
+            raise InvalidBatch(f'Nieobsługiwana metoda w żądaniu nr {index}')
+        if not isinstance(path, str) or not path.startswith('/api/'):
+            raise InvalidBatch(f'Nieprawidłowa ścieżka w żądaniu nr {index}')
+        if path.startswith(EXCLUDED_PREFIXES):
+            raise InvalidBatch(f'Żądanie nr {index} nie może być częścią paczki')
+        parsed.append({'method': method, 'path': path, 'body': item.get('body')})
+    return parsed
+
+
+@contextmanager
+def batch_transaction():
+    # Jedna transakcja bazy dla całej paczki: commit() w widokach zwalnia tylko SAVEPOINT,
+    # a rollback() cofa zmiany bieżącego żądania
+    previous = db.session.registry() if db.session.registry.has() else None
+    connection = db.engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode='create_savepoint', query_cls=Query)
+    db.session.registry.set(session)
+    g.batch = True
+    try:
+        yield transaction
+    finally:
+        g.pop('batch', None)
+        session.close()
+        if transaction.is_active:
+            transaction.rollback()
+        connection.close()
+        if previous is not None:
+            db.session.registry.set(previous)
+        else:
+            db.session.registry.clear()
+
+
+def dispatch(item, headers):
+    # Środowisko WSGI żądania składowego na wzór żądania paczki (host, schemat, adres klienta)
+    builder = EnvironBuilder(
+        path=item['path'], method=item['method'], json=item['body'], headers=headers,
+        base_url=request.host_url, environ_base={'REMOTE_ADDR': request.remote_addr}
+    )
+    try:
+        environ = builder.get_environ()
+    finally:
+        builder.close()
+
+    # Wywołanie widoku w procesie - ten sam kontekst aplikacji, więc ta sama sesja bazy
+    with current_app.request_context(environ):
+        response = current_app.full_dispatch_request()
+
+    body = response.get_json(silent=True) if response.is_json else None
+    return {'status': response.status_code, 'body': body}
+
+
+def run_batch(items, headers, atomic=True):
+    results = []
+    failed = False
+
+    with batch_transaction() as transaction:
+        for item in items:
+            try:
+                result = dispatch(item, headers)
+            except Exception as e:
+                result = {'status': 500, 'body': {'error': str(e)}}
+
+            results.append(result)
+            if result['status'] >= 400:
+                failed = True
+                # Cofnięcie niezatwierdzonych zmian nieudanego żądania
+                db.session.rollback()
+                if atomic:
+                    break
+
+        # Zamknięcie ostatniego SAVEPOINT sesji, potem jeden COMMIT lub ROLLBACK całej paczki
+        if failed and atomic:
+            db.session.rollback()
+            transaction.rollback()
+        else:
+            # Zatwierdzenie paczki podbija wersję danych raz, w tej samej transakcji
+            g.pop('batch', None)
+            db.session.commit()
+            transaction.commit()
+
+    return results, failed and atomic
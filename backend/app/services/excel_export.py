@@ -0,0 +1,71 @@
+from tempfile import SpooledTemporaryFile
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.utils import get_column_letter
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Do tego rozmiaru plik trzymany jest w pamięci, powyżej trafia na dysk
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+
+def setup_header_style(cell):
+    cell.font = Font(bold=True, color="FFFFFF")
+    cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    cell.alignment = Alignment(horizontal="center", vertical="center")
+    cell.border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+
+
+class ExcelReportWriter:
+    # Skoroszyt w trybie write-only: wiersze są zapisywane od razu, bez trzymania arkusza w pamięci
+
+    def __init__(self):
+        self.workbook = Workbook(write_only=True)
+
+    def add_sheet(self, title, headers, column_width, rows):
+        ws = self.workbook.create_sheet(title)
+
+        for col in range(1, len(headers) + 1):
+            ws.column_dimensions[get_column_letter(col)].width = column_width
+
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            setup_header_style(cell)
+            header_cells.append(cell)
+        ws.append(header_cells)
+
+        for row in rows:
+            ws.append(row)
+
+    def save(self):
+        buffer = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        self.workbook.save(buffer)
+        buffer.seek(0)
+        return buffer
+
+
+def buffer_size(buffer):
+    position = buffer.tell()
+    buffer.seek(0, 2)
+    size = buffer.tell()
+    buffer.seek(position)
+    return size
+
+
+def iter_buffer(buffer, chunk_size=CHUNK_SIZE):
+    try:
+        while True:
+            chunk = buffer.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        buffer.close()
@@ -0,0 +1,23 @@
+class InvalidFields(ValueError):
+    pass
+
+
+def parse_fields(value, available, required=()):
+    # Parametr ?fields=a,b,c - lista pól odpowiedzi; domyślnie wszystkie
+    if not value:
+        return list(available)
+
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in available]
+    if unknown:
+        raise InvalidFields(f"Nieznane pola: {', '.join(unknown)}")
+
+    return [field for field in available if field in fields or field in required]
+
+
+def parse_flag(data, name, default):
+    # Flaga w treści JSON musi być wartością logiczną - tekst "false" byłby prawdą
+    value = data.get(name, default)
+    if not isinstance(value, bool):
+        raise ValueError(f'Pole {name} musi mieć wartość true lub false')
+    return value
@@ -0,0 +1,409 @@
+import math
+import uuid
+from datetime import date, datetime, timedelta
+from sqlalchemy import String, cast, delete, literal, null, select, tuple_, union_all, update
+from sqlalchemy.dialects.postgresql import UUID
+from .. import db
+from ..models import Employee, EmployeeCost, EmployeeRevenue, Workplace, WorkplaceCost, WorkplaceRevenue
+from .rollups import RollupDeltas, apply_deltas
+
+# Rodzaj księgi -> (model miejsc pracy, model pracowników)
+LEDGERS = {
+    'costs': (WorkplaceCost, EmployeeCost),
+    'revenues': (WorkplaceRevenue, EmployeeRevenue)
+}
+
+LEDGER_FIELDS = (
+    'id', 'type', 'workplace_id', 'workplace_name', 'employee_id', 'employee_name',
+    'description', 'amount', 'date', 'created_at'
+)
+LEDGER_REQUIRED_FIELDS = ('id', 'type', 'date')
+
+# Pola występujące tylko w wierszach danego typu
+TYPE_FIELDS = {
+    'workplace_id': 'workplace',
+    'workplace_name': 'workplace',
+    'employee_id': 'employee',
+    'employee_name': 'employee'
+}
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+# Granica kwoty wiersza księgi - większe wartości przestają mieć sens (i przepełniają typy)
+MAX_LEDGER_AMOUNT = 10 ** 9
+
+# Sortowanie -> (kolumna, rosnąco); kursor zawiera wartość tej kolumny i id
+LEDGER_SORTS = {
+    'date_desc': ('date', False),
+    'date_asc': ('date', True),
+    'amount_desc': ('amount', False),
+    'amount_asc': ('amount', True)
+}
+DEFAULT_LEDGER_SORT = 'date_desc'
+
+# Pola, które można zmienić operacją zbiorczą; shift_days przesuwa daty o liczbę dni
+LEDGER_PATCH_FIELDS = ('description', 'amount', 'date', 'shift_days')
+MAX_DESCRIPTION_LENGTH = 200
+# Granica przesunięcia dat w zmianach zbiorczych - dalej data przestaje mieć sens (i wychodzi poza zakres typu)
+MAX_SHIFT_DAYS = 3660
+
+# Parsery wartości kursora dla kolumn sortowania
+CURSOR_PARSERS = {
+    'date': datetime.fromisoformat,
+    'amount': float
+}
+
+# Filtry listy -> parser wartości parametru zapytania
+LEDGER_FILTERS = {
+    'type': str,
+    'workplace_id': uuid.UUID,
+    'employee_id': uuid.UUID,
+    'start': date.fromisoformat,
+    'end': date.fromisoformat,
+    'min_amount': float,
+    'max_amount': float
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(value, row_id):
+    value = value.isoformat() if hasattr(value, 'isoformat') else repr(float(value))
+    return f'{value},{row_id}'
+
+
+def decode_cursor(cursor, parser=datetime.fromisoformat):
+    try:
+        value, row_id = cursor.rsplit(',', 1)
+        return parser(value), uuid.UUID(row_id)
+    except ValueError:
+        raise InvalidCursor('Nieprawidłowy kursor')
+
+
+def page_size(value):
+    if value is None:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(value), MAX_PAGE_SIZE))
+
+
+def parse_ledger_filters(args):
+    filters = {}
+    for name, parser in LEDGER_FILTERS.items():
+        value = args.get(name)
+        if value:
+            filters[name] = parser(value)
+    if filters.get('type') not in (None, 'workplace', 'employee'):
+        raise ValueError('Nieprawidłowy typ')
+    return filters
+
+
+def _filter_branch(stmt, model, filters):
+    if filters.get('ids'):
+        stmt = stmt.where(model.id.in_(filters['ids']))
+    if filters.get('start') is not None:
+        stmt = stmt.where(model.date >= filters['start'])
+    if filters.get('end') is not None:
+        # Koniec zakresu włącznie - kolumna date przechowuje także czas
+        stmt = stmt.where(model.date < filters['end'] + timedelta(days=1))
+    if filters.get('min_amount') is not None:
+        stmt = stmt.where(model.amount >= filters['min_amount'])
+    if filters.get('max_amount') is not None:
+        stmt = stmt.where(model.amount <= filters['max_amount'])
+    return stmt
+
+
+def _workplace_columns(model):
+    return {
+        'id': model.id,
+        'type': literal('workplace'),
+        'workplace_id': model.workplace_id,
+        'workplace_name': Workplace.name,
+        'employee_id': cast(null(), UUID(as_uuid=True)),
+        'employee_name': cast(null(), String),
+        'description': model.description,
+        'amount': model.amount,
+        'date': model.date,
+        'created_at': model.created_at
+    }
+
+
+def _employee_columns(model):
+    return {
+        'id': model.id,
+        'type': literal('employee'),
+        'workplace_id': cast(null(), UUID(as_uuid=True)),
+        'workplace_name': cast(null(), String),
+        'employee_id': model.employee_id,
+        'employee_name': Employee.first_name + ' ' + Employee.last_name,
+        'description': model.description,
+        'amount': model.amount,
+        'date': model.date,
+        'created_at': model.created_at
+    }
+
+
+def _branch(columns, fields):
+    # Tylko żądane kolumny, w tej samej kolejności w obu gałęziach UNION ALL
+    return select(*[columns[field].label(field) for field in LEDGER_FIELDS if field in fields])
+
+
+def _workplace_branch(model, manager_id, fields):
+    return _branch(_workplace_columns(model), fields).join(
+        Workplace, model.workplace_id == Workplace.id
+    ).where(
+        Workplace.manager_id == manager_id
+    )
+
+
+def _employee_branch(model, manager_id, fields):
+    return _branch(_employee_columns(model), fields).join(
+        Employee, model.employee_id == Employee.id
+    ).where(
+        Employee.manager_id == manager_id
+    )
+
+
+def _branch_type(filters):
+    branch_type = filters.get('type')
+    # Filtr po miejscu pracy wyklucza wpisy pracowników i odwrotnie
+    if filters.get('workplace_id') is not None:
+        branch_type = 'workplace' if branch_type in (None, 'workplace') else 'none'
+    if filters.get('employee_id') is not None:
+        branch_type = 'employee' if branch_type in (None, 'employee') else 'none'
+    return branch_type
+
+
+def _ledger_branches(kind, manager_id, filters, fields):
+    workplace_model, employee_model = LEDGERS[kind]
+    branch_type = _branch_type(filters)
+
+    branches = []
+    if branch_type in (None, 'workplace'):
+        branch = _workplace_branch(workplace_model, manager_id, fields)
+        if filters.get('workplace_id') is not None:
+            branch = branch.where(workplace_model.workplace_id == filters['workplace_id'])
+        branches.append((workplace_model, _filter_branch(branch, workplace_model, filters)))
+    if branch_type in (None, 'employee'):
+        branch = _employee_branch(employee_model, manager_id, fields)
+        if filters.get('employee_id') is not None:
+            branch = branch.where(employee_model.employee_id == filters['employee_id'])
+        branches.append((employee_model, _filter_branch(branch, employee_model, filters)))
+    return branches
+
+
+def ledger_page_query(kind, manager_id, after=None, limit=DEFAULT_PAGE_SIZE, fields=LEDGER_FIELDS,
+                      filters=None, sort=DEFAULT_LEDGER_SORT):
+    sort_field, ascending = LEDGER_SORTS[sort]
+
+    branches = []
+    for model, branch in _ledger_branches(kind, manager_id, filters or {}, fields):
+        sort_column = getattr(model, sort_field)
+        # Warunek kursora, sortowanie i limit w każdej gałęzi osobno - odczyt tylko początku indeksu
+        if after is not None:
+            position = tuple_(sort_column, model.id)
+            branch = branch.where(position > tuple_(*after) if ascending else position < tuple_(*after))
+        if ascending:
+            branch = branch.order_by(sort_column.asc(), model.id.asc())
+        else:
+            branch = branch.order_by(sort_column.desc(), model.id.desc())
+        branches.append(select(branch.limit(limit + 1).subquery()))
+
+    if not branches:
+        return None
+
+    merged = (union_all(*branches) if len(branches) > 1 else branches[0]).subquery()
+    sort_column = merged.c[sort_field]
+    if ascending:
+        order = (sort_column.asc(), merged.c.id.asc())
+    else:
+        order = (sort_column.desc(), merged.c.id.desc())
+    return select(merged).order_by(*order).limit(limit + 1)
+
+
+def serialize_ledger_row(row, fields=LEDGER_FIELDS):
+    item = {}
+    for field in fields:
+        if field in TYPE_FIELDS and TYPE_FIELDS[field] != row.type:
+            continue
+        value = getattr(row, field)
+        if field == 'amount':
+            value = float(value)
+        # Daty i UUID koduje dostawca JSON aplikacji (ISO 8601)
+        item[field] = value
+    return item
+
+
+def ledger_page(kind, manager_id, cursor=None, limit=None, fields=None, filters=None, sort=None):
+    sort = sort or DEFAULT_LEDGER_SORT
+    if sort not in LEDGER_SORTS:
+        raise ValueError(f"Nieznane sortowanie: {sort}")
+    sort_field = LEDGER_SORTS[sort][0]
+
+    after = decode_cursor(cursor, CURSOR_PARSERS[sort_field]) if cursor else None
+    limit = page_size(limit)
+    fields = fields or list(LEDGER_FIELDS)
+    # Kolumny kursora i typu są potrzebne zawsze
+    selected = [
+        field for field in LEDGER_FIELDS
+        if field in fields or field in LEDGER_REQUIRED_FIELDS or field == sort_field
+    ]
+
+    stmt = ledger_page_query(kind, manager_id, after, limit, selected, filters, sort)
+    rows = db.session.execute(stmt).all() if stmt is not None else []
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(getattr(rows[-1], sort_field), rows[-1].id)
+
+    return {
+        'items': [serialize_ledger_row(row, fields) for row in rows],
+        'next_cursor': next_cursor
+    }
+
+
+def parse_bulk_filters(data):
+    if not isinstance(data, dict):
+        raise ValueError('Brak filtra')
+
+    filters = {}
+    for name, parser in LEDGER_FILTERS.items():
+        value = data.get(name)
+        if value not in (None, ''):
+            filters[name] = parser(str(value))
+    if filters.get('type') not in (None, 'workplace', 'employee'):
+        raise ValueError('Nieprawidłowy typ')
+
+    ids = data.get('ids')
+    if ids is not None:
+        if not isinstance(ids, list) or not ids:
+            raise ValueError('Nieprawidłowa lista identyfikatorów')
+        filters['ids'] = [uuid.UUID(str(value)) for value in ids]
+
+    # Zabezpieczenie przed przypadkową zmianą całej księgi
+    if not any(name in filters for name in ('ids', 'start', 'end', 'workplace_id', 'employee_id')):
+        raise ValueError('Wymagany jest filtr: ids, zakres dat, miejsce pracy lub pracownik')
+    return filters
+
+
+def parse_ledger_patch(data):
+    if not isinstance(data, dict) or not data:
+        raise ValueError('Brak zmian do wprowadzenia')
+
+    unknown = [field for field in data if field not in LEDGER_PATCH_FIELDS]
+    if unknown:
+        raise ValueError(f"Nieznane pola: {', '.join(unknown)}")
+    if 'date' in data and 'shift_days' in data:
+        raise ValueError('Nie można jednocześnie ustawić i przesunąć daty')
+
+    patch = {}
+    if 'description' in data:
+        description = data['description']
+        if description is not None and len(str(description)) > MAX_DESCRIPTION_LENGTH:
+            raise ValueError(f'Opis dłuższy niż {MAX_DESCRIPTION_LENGTH} znaków')
+        patch['description'] = str(description) if description is not None else None
+    if 'amount' in data:
+        patch['amount'] = float(data['amount'])
+        if not math.isfinite(patch['amount']) or abs(patch['amount']) > MAX_LEDGER_AMOUNT:
+            raise ValueError(f'Kwota musi mieścić się w przedziale ±{MAX_LEDGER_AMOUNT}')
+    if 'date' in data:
+        patch['date'] = datetime.fromisoformat(str(data['date']))
+    if 'shift_days' in data:
+        shift_days = data['shift_days']
+        # Tylko liczba całkowita JSON - 1.9, true czy "7" nie mogą po cichu przesunąć wszystkich wierszy
+        if not isinstance(shift_days, int) or isinstance(shift_days, bool):
+            raise ValueError('Pole shift_days musi być liczbą całkowitą')
+        patch['shift_days'] = shift_days
+        if abs(shift_days) > MAX_SHIFT_DAYS:
+            raise ValueError(f'Przesunięcie dat może wynosić najwyżej {MAX_SHIFT_DAYS} dni')
+    return patch
+
+
+def _bulk_targets(kind, filters):
+    workplace_model, employee_model = LEDGERS[kind]
+    branch_type = _branch_type(filters)
+
+    targets = []
+    if branch_type in (None, 'workplace'):
+        targets.append((workplace_model, Workplace, 'workplace_id'))
+    if branch_type in (None, 'employee'):
+        targets.append((employee_model, Employee, 'employee_id'))
+    return targets
+
+
+def _bulk_where(stmt, model, owner_model, key_attr, manager_id, filters):
+    key_column = getattr(model, key_attr)
+    # Przynależność sprawdzana w tym samym zapytaniu - bez pobierania wierszy do aplikacji
+    stmt = stmt.where(
+        key_column.in_(select(owner_model.id).where(owner_model.manager_id == manager_id))
+    )
+    if filters.get(key_attr) is not None:
+        stmt = stmt.where(key_column == filters[key_attr])
+    return _filter_branch(stmt, model, filters)
+
+
+def _patch_values(table, patch):
+    values = {'updated_at': datetime.utcnow()}
+    for field in ('description', 'amount', 'date'):
+        if field in patch:
+            values[field] = patch[field]
+    if 'shift_days' in patch:
+        values['date'] = table.c.date + timedelta(days=patch['shift_days'])
+    return values
+
+
+def bulk_update_ledger(kind, manager_id, filters, patch):
+    deltas = RollupDeltas()
+    updated = 0
+
+    for model, owner_model, key_attr in _bulk_targets(kind, filters):
+        # Stare wartości z podzapytania blokującego wiersze, nowe z RETURNING - jedno UPDATE ... FROM
+        old = _bulk_where(
+            select(model.id, model.amount, model.date), model, owner_model, key_attr, manager_id, filters
+        ).with_for_update().subquery()
+
+        table = model.__table__
+        stmt = update(table).where(
+            table.c.id == old.c.id
+        ).values(
+            _patch_values(table, patch)
+        ).returning(
+            table.c[key_attr], old.c.amount.label('old_amount'), old.c.date.label('old_date'), table.c.amount, table.c.date
+        )
+
+        rows = db.session.execute(stmt).all()
+        for key, old_amount, old_date, new_amount, new_date in rows:
+            deltas.add(model, {key_attr: key, 'amount': old_amount, 'date': old_date}, sign=-1)
+            deltas.add(model, {key_attr: key, 'amount': new_amount, 'date': new_date})
+        updated += len(rows)
+
+    # UPDATE Core omija nasłuch after_flush - agregaty aktualizowane jawnie
+    if deltas:
+        apply_deltas(db.session.connection(), deltas)
+    db.session.commit()
+    return updated
+
+
+def bulk_delete_ledger(kind, manager_id, filters):
+    deltas = RollupDeltas()
+    deleted = 0
+
+    for model, owner_model, key_attr in _bulk_targets(kind, filters):
+        table = model.__table__
+        stmt = _bulk_where(
+            delete(table), model, owner_model, key_attr, manager_id, filters
+        ).returning(
+            table.c[key_attr], table.c.amount, table.c.date
+        )
+
+        rows = db.session.execute(stmt).all()
+        for key, amount, row_date in rows:
+            deltas.add(model, {key_attr: key, 'amount': amount, 'date': row_date}, sign=-1)
+        deleted += len(rows)
+
+    if deltas:
+        apply_deltas(db.session.connection(), deltas)
+    db.session.commit()
+    return deleted
@@ -0,0 +1,91 @@
+import csv
+import io
+import json
+import uuid
+from datetime import date, datetime
+from sqlalchemy import select
+from ..models import Employee, EmployeeCost, EmployeeRevenue, Schedule, Workplace, WorkplaceCost, WorkplaceRevenue
+from .aggregates import stream_rows
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson'
+}
+
+# Zbiór danych -> (model, model właściciela, kolumna łącząca, eksportowane kolumny)
+EXPORT_DATASETS = {
+    'workplace_costs': (WorkplaceCost, Workplace, 'workplace_id',
+                        ['id', 'workplace_id', 'description', 'amount', 'date', 'created_at', 'updated_at']),
+    'employee_costs': (EmployeeCost, Employee, 'employee_id',
+                       ['id', 'employee_id', 'description', 'amount', 'date', 'created_at', 'updated_at']),
+    'workplace_revenues': (WorkplaceRevenue, Workplace, 'workplace_id',
+                           ['id', 'workplace_id', 'description', 'amount', 'date', 'created_at', 'updated_at']),
+    'employee_revenues': (EmployeeRevenue, Employee, 'employee_id',
+                          ['id', 'employee_id', 'description', 'amount', 'date', 'created_at', 'updated_at']),
+    'schedules': (Schedule, Workplace, 'workplace_id',
+                  ['id', 'workplace_id', 'employee_id', 'date', 'hours', 'created_at', 'updated_at'])
+}
+
+# Liczba wierszy sformatowanych przed wysłaniem kolejnego fragmentu odpowiedzi
+ROWS_PER_CHUNK = 1000
+
+
+def export_columns(dataset):
+    return EXPORT_DATASETS[dataset][3]
+
+
+def export_query(dataset, manager_id, start_date, end_date):
+    # Projekcja kolumn zamiast obiektów ORM - bez mapy tożsamości sesji
+    model, owner, key_attr, columns = EXPORT_DATASETS[dataset]
+    return select(
+        *[getattr(model, column) for column in columns]
+    ).join(
+        owner, getattr(model, key_attr) == owner.id
+    ).where(
+        owner.manager_id == manager_id,
+        model.date >= start_date,
+        model.date < end_date
+    ).order_by(model.date, model.id)
+
+
+def plain_value(value):
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def iter_csv(stmt, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    for index, row in enumerate(stream_rows(stmt), 1):
+        writer.writerow([plain_value(value) for value in row])
+        if index % ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+def iter_ndjson(stmt, columns):
+    lines = []
+    for row in stream_rows(stmt):
+        lines.append(json.dumps(dict(zip(columns, (plain_value(value) for value in row))), ensure_ascii=False))
+        if len(lines) == ROWS_PER_CHUNK:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def iter_export(export_format, dataset, manager_id, start_date, end_date):
+    stmt = export_query(dataset, manager_id, start_date, end_date)
+    columns = export_columns(dataset)
+    if export_format == 'csv':
+        return iter_csv(stmt, columns)
+    return iter_ndjson(stmt, columns)
@@ -0,0 +1,206 @@
+import csv
+import io
+import math
+import uuid
+from datetime import date, datetime
+from itertools import islice
+from openpyxl import load_workbook
+from sqlalchemy import insert, select
+from .. import db
+from ..models import Employee, Workplace
+from .ledger import LEDGERS, MAX_LEDGER_AMOUNT
+from .rollups import RollupDeltas, apply_deltas
+
+IMPORT_FORMATS = ('csv', 'xlsx')
+IMPORT_COLUMNS = ('type', 'workplace_id', 'employee_id', 'description', 'amount', 'date')
+
+# Wiersze walidowane i zapisywane paczkami - stała pamięć niezależnie od rozmiaru pliku
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+# Limit kolumny description w tabelach kosztów i przychodów
+MAX_DESCRIPTION_LENGTH = 200
+
+
+class InvalidImport(ValueError):
+    pass
+
+
+def import_format(filename):
+    extension = (filename or '').rsplit('.', 1)[-1].lower()
+    if extension not in IMPORT_FORMATS:
+        raise InvalidImport(f"Nieobsługiwany format pliku, dozwolone: {', '.join(IMPORT_FORMATS)}")
+    return extension
+
+
+def _header(values):
+    return [str(value).strip().lower() if value is not None else '' for value in values]
+
+
+def _csv_rows(stream):
+    reader = csv.reader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    header = _header(next(reader, []))
+    for values in reader:
+        if any(value.strip() for value in values):
+            yield dict(zip(header, values))
+
+
+def _xlsx_rows(stream):
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = _header(next(rows, ()))
+        for values in rows:
+            if any(value not in (None, '') for value in values):
+                yield dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def read_rows(stream, file_format):
+    missing = None
+    rows = _csv_rows(stream) if file_format == 'csv' else _xlsx_rows(stream)
+    for row in rows:
+        if missing is None:
+            missing = [column for column in ('type', 'amount', 'date') if column not in row]
+            if missing:
+                raise InvalidImport(f"Brak kolumn: {', '.join(missing)}")
+        yield row
+
+
+def _parse_date(value):
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return datetime.fromisoformat(str(value).strip())
+
+
+def _parse_uuid(value, name):
+    if value in (None, ''):
+        raise ValueError(f'Brak pola {name}')
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value).strip())
+
+
+def parse_row(row):
+    entry_type = str(row.get('type') or '').strip().lower()
+    if entry_type not in ('workplace', 'employee'):
+        raise ValueError('Nieprawidłowy typ')
+
+    key = f'{entry_type}_id'
+    description = row.get('description')
+    description = str(description).strip() if description not in (None, '') else None
+    if description and len(description) > MAX_DESCRIPTION_LENGTH:
+        raise ValueError(f'Opis dłuższy niż {MAX_DESCRIPTION_LENGTH} znaków')
+
+    try:
+        amount = float(row.get('amount'))
+    except (TypeError, ValueError):
+        raise ValueError('Nieprawidłowa kwota')
+    # NaN lub nieskończoność w agregatach dziennych nie dałyby się już odjąć
+    if not math.isfinite(amount) or abs(amount) > MAX_LEDGER_AMOUNT:
+        raise ValueError(f'Kwota musi mieścić się w przedziale ±{MAX_LEDGER_AMOUNT}')
+
+    try:
+        entry_date = _parse_date(row.get('date'))
+    except (TypeError, ValueError):
+        raise ValueError('Nieprawidłowa data')
+
+    return entry_type, {
+        key: _parse_uuid(row.get(key), key),
+        'description': description,
+        'amount': amount,
+        'date': entry_date
+    }
+
+
+class OwnershipResolver:
+    # Sprawdza przynależność miejsc pracy i pracowników jednym zapytaniem na paczkę
+
+    def __init__(self, manager_id):
+        self.manager_id = manager_id
+        self.checked = {'workplace': {}, 'employee': {}}
+
+    def resolve(self, entry_type, ids):
+        model = Workplace if entry_type == 'workplace' else Employee
+        checked = self.checked[entry_type]
+        pending = {entity_id for entity_id in ids if entity_id not in checked}
+        if pending:
+            owned = set(db.session.execute(
+                select(model.id).where(model.id.in_(pending), model.manager_id == self.manager_id)
+            ).scalars())
+            for entity_id in pending:
+                checked[entity_id] = entity_id in owned
+
+    def owns(self, entry_type, entity_id):
+        return self.checked[entry_type][entity_id]
+
+
+def _batches(rows, size):
+    # Numer wiersza w pliku, licząc nagłówek jako wiersz 1
+    numbered = enumerate(rows, start=2)
+    while True:
+        batch = list(islice(numbered, size))
+        if not batch:
+            return
+        yield batch
+
+
+def import_ledger(kind, manager_id, rows, skip_invalid=False):
+    workplace_model, employee_model = LEDGERS[kind]
+    models = {'workplace': workplace_model, 'employee': employee_model}
+    resolver = OwnershipResolver(manager_id)
+    deltas = RollupDeltas()
+
+    imported = 0
+    error_count = 0
+    errors = []
+
+    def reject(line, message):
+        nonlocal error_count
+        error_count += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({'row': line, 'error': message})
+
+    for batch in _batches(rows, IMPORT_BATCH_SIZE):
+        parsed = []
+        for line, row in batch:
+            try:
+                parsed.append((line, *parse_row(row)))
+            except ValueError as e:
+                reject(line, str(e))
+
+        for entry_type in models:
+            resolver.resolve(entry_type, {values[f'{entry_type}_id'] for _, t, values in parsed if t == entry_type})
+
+        valid = {'workplace': [], 'employee': []}
+        for line, entry_type, values in parsed:
+            if not resolver.owns(entry_type, values[f'{entry_type}_id']):
+                reject(line, 'Nie znaleziono miejsca pracy' if entry_type == 'workplace' else 'Nie znaleziono pracownika')
+                continue
+            valid[entry_type].append(values)
+
+        # Tryb atomowy - po pierwszym błędzie pozostałe wiersze są tylko walidowane
+        if error_count and not skip_invalid:
+            continue
+
+        for entry_type, values in valid.items():
+            if not values:
+                continue
+            model = models[entry_type]
+            # Wielowierszowy INSERT z pominięciem jednostki pracy ORM
+            db.session.execute(insert(model.__table__), values)
+            for value in values:
+                deltas.add(model, value)
+            imported += len(values)
+
+    if error_count and not skip_invalid:
+        db.session.rollback()
+        return {'imported': 0, 'error_count': error_count, 'errors': errors}
+
+    # Wstawienia Core omijają nasłuch after_flush - agregaty aktualizowane jawnie
+    if deltas:
+        apply_deltas(db.session.connection(), deltas)
+    db.session.commit()
+
+    return {'imported': imported, 'error_count': error_count, 'errors': errors}
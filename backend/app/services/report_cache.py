@@ -0,0 +1,77 @@
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+
+
+def normalize_params(params):
+    items = []
+    for key, value in sorted(params.items()):
+        if isinstance(value, (date, datetime)):
+            value = value.isoformat()
+        items.append((key, value))
+    return tuple(items)
+
+
+class ReportCache:
+    # Cache wyników raportów (LRU), unieważniany wersją danych managera
+
+    def __init__(self, app=None):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.maxsize = 256
+        self.hits = 0
+        self.misses = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.maxsize = app.config.get('REPORT_CACHE_SIZE', 256)
+        app.extensions['report_cache'] = self
+
+    def generation(self, manager_id):
+        # Wersja danych z bazy - wspólna dla wszystkich procesów aplikacji
+        from .versioning import data_version
+        return data_version(manager_id)
+
+    def discard(self, manager_id):
+        manager_id = str(manager_id)
+        with self.lock:
+            for key in [key for key in self.entries if key[0] == manager_id]:
+                del self.entries[key]
+
+    def get_or_compute(self, manager_id, name, params, compute):
+        manager_id = str(manager_id)
+        generation = self.generation(manager_id)
+        key = (manager_id, generation, name, normalize_params(params))
+
+        with self.lock:
+            if key in self.entries:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return self.entries[key]
+            self.misses += 1
+
+        value = compute()
+
+        # Zapis w trakcie liczenia raportu - wynik może być nieaktualny
+        fresh = self.generation(manager_id) == generation
+
+        with self.lock:
+            if fresh and self.maxsize > 0:
+                self.entries[key] = value
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.maxsize:
+                    self.entries.popitem(last=False)
+
+        return value
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0,
+                'size': len(self.entries),
+                'maxsize': self.maxsize
+            }
@@ -0,0 +1,133 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ReportJobQueueFull(Exception):
+    pass
+
+
+class ReportJob:
+    def __init__(self, manager_id, kind, params):
+        self.id = uuid.uuid4()
+        self.manager_id = str(manager_id)
+        self.kind = kind
+        self.params = params
+        self.status = 'pending'
+        self.error = None
+        self.result = None
+        self.file_path = None
+        self.filename = None
+        self.mimetype = None
+        self.created_at = time.time()
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.status in ('done', 'failed')
+
+    def to_dict(self):
+        return {
+            'id': str(self.id),
+            'kind': self.kind,
+            'status': self.status,
+            'error': self.error,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at
+        }
+
+
+class ReportJobQueue:
+    # Kolejka zadań raportowych w procesie aplikacji - bez zewnętrznego brokera
+
+    def __init__(self, app=None):
+        self.app = None
+        self.executor = None
+        self.artifact_dir = None
+        self.jobs = {}
+        self.lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.ttl = app.config.get('REPORT_JOB_TTL', 3600)
+        self.max_pending = app.config.get('REPORT_JOB_MAX_PENDING', 20)
+        app.extensions['report_jobs'] = self
+
+    def _start(self):
+        # Katalog i wątki tworzone przy pierwszym zadaniu - create_app (CLI, testy) ich nie potrzebuje
+        if self.executor is None:
+            self.artifact_dir = self.app.config.get('REPORT_JOB_DIR') or tempfile.mkdtemp(prefix='report-jobs-')
+            os.makedirs(self.artifact_dir, exist_ok=True)
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.app.config.get('REPORT_JOB_WORKERS', 2),
+                thread_name_prefix='report-job'
+            )
+
+    def submit(self, manager_id, kind, body, params):
+        self.purge_expired()
+
+        with self.lock:
+            pending = sum(1 for job in self.jobs.values() if not job.finished)
+            if pending >= self.max_pending:
+                raise ReportJobQueueFull()
+
+            job = ReportJob(manager_id, kind, params)
+            self.jobs[job.id] = job
+            self._start()
+
+        self.executor.submit(self._run, job, body)
+        return job
+
+    def get(self, manager_id, job_id):
+        self.purge_expired()
+
+        with self.lock:
+            job = self.jobs.get(job_id)
+        if job is None or job.manager_id != str(manager_id):
+            return None
+        return job
+
+    def purge_expired(self):
+        now = time.time()
+        with self.lock:
+            expired = [
+                job for job in self.jobs.values()
+                if job.finished and now - job.finished_at > self.ttl
+            ]
+            for job in expired:
+                del self.jobs[job.id]
+
+        for job in expired:
+            if job.file_path:
+                try:
+                    os.unlink(job.file_path)
+                except OSError:
+                    pass
+
+    def _run(self, job, body):
+        job.status = 'running'
+        try:
+            with self.app.app_context():
+                result = body(job.manager_id, **job.params)
+
+            if hasattr(result, 'read'):
+                # Artefakt plikowy - zapisz na dysk, aby był dostępny do pobrania przez TTL
+                job.file_path = os.path.join(self.artifact_dir, f'{job.id}.bin')
+                with open(job.file_path, 'wb') as f:
+                    shutil.copyfileobj(result, f)
+                result.close()
+            else:
+                job.result = result
+
+            job.status = 'done'
+        except Exception as e:
+            job.status = 'failed'
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
@@ -0,0 +1,105 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from queue import Empty, Full, Queue
+from flask import current_app
+from .aggregates import stream_rows
+
+_executor = None
+_executor_lock = threading.Lock()
+_END = object()
+
+# Co ile sekund zablokowany producent sprawdza, czy odbiorca nie zrezygnował z sekcji
+_POLL_INTERVAL = 0.1
+
+
+class _SectionFailure:
+    def __init__(self, error):
+        self.error = error
+
+
+def _get_executor(app):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config.get('REPORT_SECTION_WORKERS', 4),
+                thread_name_prefix='report-section'
+            )
+        return _executor
+
+
+class SectionStream:
+    # Wiersze sekcji raportu pobierane w osobnym wątku, z własną sesją i połączeniem z puli
+
+    def __init__(self, app, stmt, maxsize):
+        self.app = app
+        self.stmt = stmt
+        # Kolejka ograniczona - szybki producent czeka na odbiorcę zamiast buforować całą sekcję
+        self.queue = Queue(maxsize=maxsize)
+        self.cancelled = threading.Event()
+        self.finished = threading.Event()
+
+    def _put(self, item):
+        while not self.cancelled.is_set():
+            try:
+                self.queue.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except Full:
+                continue
+        return False
+
+    def produce(self):
+        try:
+            with self.app.app_context():
+                for row in stream_rows(self.stmt):
+                    if not self._put(row):
+                        return
+            self._put(_END)
+        except Exception as e:
+            self._put(_SectionFailure(e))
+        finally:
+            self.finished.set()
+
+    def close(self):
+        # Odbiorca kończy wcześniej (np. błąd innej sekcji) - zwalnia wątek i połączenie producenta
+        self.cancelled.set()
+        while True:
+            try:
+                self.queue.get_nowait()
+            except Empty:
+                return
+
+    def __iter__(self):
+        while True:
+            item = self.queue.get()
+            if item is _END:
+                return
+            if isinstance(item, _SectionFailure):
+                raise item.error
+            yield item
+
+
+def run_sections(statements):
+    # Uruchamia niezależne zapytania równolegle; wyniki można konsumować w trakcie ich pobierania
+    app = current_app._get_current_object()
+    executor = _get_executor(app)
+    maxsize = app.config.get('REPORT_SECTION_QUEUE_SIZE', 1000)
+
+    streams = []
+    for stmt in statements:
+        stream = SectionStream(app, stmt, maxsize)
+        executor.submit(stream.produce)
+        streams.append(stream)
+    return streams
+
+
+@contextmanager
+def report_sections(statements):
+    # Iterator sekcji w kolejności zapytań; po wyjściu z bloku nieodczytane sekcje są anulowane
+    streams = run_sections(statements)
+    try:
+        yield iter(streams)
+    finally:
+        for stream in streams:
+            stream.close()
@@ -0,0 +1,178 @@
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy import Date, case, cast, delete, event, func, inspect, literal, select, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from ..models import (
+    EmployeeCost, EmployeeRevenue, WorkplaceCost, WorkplaceRevenue, Schedule,
+    EmployeeDailyRollup, WorkplaceDailyRollup
+)
+
+ROLLUP_FIELDS = ('costs', 'revenues', 'hours', 'cost_count', 'revenue_count', 'schedule_count')
+
+# Limit godzin z ograniczenia ck_employee_daily_rollups_hours_cap, z tolerancją na zaokrąglenia float
+HOURS_CAP = 24.0001
+
+# Kolumna encji w każdej tabeli agregatów
+ROLLUP_KEYS = {
+    EmployeeDailyRollup: 'employee_id',
+    WorkplaceDailyRollup: 'workplace_id'
+}
+
+# Model źródłowy -> (tabela agregatów, kolumna encji, kolumna wartości, pole sumy, pole licznika)
+LEDGER_SOURCES = {
+    EmployeeCost: [(EmployeeDailyRollup, 'employee_id', 'amount', 'costs', 'cost_count')],
+    EmployeeRevenue: [(EmployeeDailyRollup, 'employee_id', 'amount', 'revenues', 'revenue_count')],
+    WorkplaceCost: [(WorkplaceDailyRollup, 'workplace_id', 'amount', 'costs', 'cost_count')],
+    WorkplaceRevenue: [(WorkplaceDailyRollup, 'workplace_id', 'amount', 'revenues', 'revenue_count')],
+    Schedule: [
+        (EmployeeDailyRollup, 'employee_id', 'hours', 'hours', 'schedule_count'),
+        (WorkplaceDailyRollup, 'workplace_id', 'hours', 'hours', 'schedule_count')
+    ]
+}
+
+
+def as_day(value):
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def as_uuid(value):
+    if value is None or isinstance(value, uuid.UUID):
+        return value
+    return uuid.UUID(str(value))
+
+
+class RollupDeltas:
+    # Zmiany do naniesienia na tabele agregatów, zgrupowane po (tabela, encja, dzień)
+
+    def __init__(self):
+        self.rows = defaultdict(lambda: dict.fromkeys(ROLLUP_FIELDS, 0))
+
+    def __bool__(self):
+        return bool(self.rows)
+
+    def add(self, source_model, values, sign=1):
+        for rollup_model, key_attr, value_attr, sum_field, count_field in LEDGER_SOURCES[source_model]:
+            entity_id = as_uuid(values.get(key_attr))
+            day = as_day(values.get('date'))
+            if entity_id is None or day is None:
+                continue
+
+            row = self.rows[(rollup_model, entity_id, day)]
+            row[sum_field] += sign * float(values.get(value_attr) or 0)
+            row[count_field] += sign
+
+
+def _tracked_attrs(source_model):
+    attrs = {'date'}
+    for _, key_attr, value_attr, _, _ in LEDGER_SOURCES[source_model]:
+        attrs.update((key_attr, value_attr))
+    return attrs
+
+
+def _values(obj, attrs, old):
+    state = inspect(obj)
+    values = {}
+    for attr in attrs:
+        history = state.attrs[attr].history
+        if old:
+            current = history.deleted or history.unchanged
+        else:
+            current = history.added or history.unchanged
+        values[attr] = current[0] if current else getattr(obj, attr)
+    return values
+
+
+def collect_deltas(session):
+    deltas = RollupDeltas()
+
+    for obj in session.new:
+        if type(obj) in LEDGER_SOURCES:
+            deltas.add(type(obj), _values(obj, _tracked_attrs(type(obj)), old=False))
+
+    for obj in session.deleted:
+        if type(obj) in LEDGER_SOURCES:
+            deltas.add(type(obj), _values(obj, _tracked_attrs(type(obj)), old=True), sign=-1)
+
+    for obj in session.dirty:
+        if type(obj) not in LEDGER_SOURCES or not session.is_modified(obj):
+            continue
+        attrs = _tracked_attrs(type(obj))
+        before = _values(obj, attrs, old=True)
+        after = _values(obj, attrs, old=False)
+        if before != after:
+            deltas.add(type(obj), before, sign=-1)
+            deltas.add(type(obj), after)
+
+    return deltas
+
+
+def apply_deltas(connection, deltas):
+    by_model = defaultdict(list)
+    # Stała kolejność wierszy ogranicza ryzyko zakleszczeń przy równoległych zapisach
+    for (rollup_model, entity_id, day), values in sorted(
+        deltas.rows.items(), key=lambda item: (item[0][0].__tablename__, str(item[0][1]), item[0][2])
+    ):
+        by_model[rollup_model].append({ROLLUP_KEYS[rollup_model]: entity_id, 'day': day, **values})
+
+    for rollup_model, rows in by_model.items():
+        table = rollup_model.__table__
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ROLLUP_KEYS[rollup_model], 'day'],
+            set_={field: table.c[field] + stmt.excluded[field] for field in ROLLUP_FIELDS}
+        )
+        connection.execute(stmt)
+
+
+@event.listens_for(Session, 'after_flush')
+def update_rollups(session, flush_context):
+    # Agregaty aktualizowane są w tej samej transakcji co zapis do tabel źródłowych
+    deltas = collect_deltas(session)
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+
+
+def _source_rows(rollup_model):
+    selects = []
+    for source_model, targets in LEDGER_SOURCES.items():
+        for target_model, key_attr, value_attr, sum_field, count_field in targets:
+            if target_model is not rollup_model:
+                continue
+            key_column = getattr(source_model, key_attr)
+            columns = [
+                key_column.label('entity_id'),
+                cast(source_model.date, Date).label('day')
+            ]
+            for field in ROLLUP_FIELDS:
+                if field == sum_field:
+                    columns.append(getattr(source_model, value_attr).label(field))
+                elif field == count_field:
+                    columns.append(literal(1).label(field))
+                else:
+                    columns.append(literal(0).label(field))
+            selects.append(select(*columns).where(key_column.isnot(None)))
+    return union_all(*selects).subquery()
+
+
+def rebuild(connection):
+    # Pełne przeliczenie agregatów z tabel źródłowych
+    for rollup_model, key_attr in ROLLUP_KEYS.items():
+        rows = _source_rows(rollup_model)
+        columns = [key_attr, 'day', *ROLLUP_FIELDS]
+        sums = [func.sum(rows.c[field]) for field in ROLLUP_FIELDS]
+        if rollup_model is EmployeeDailyRollup:
+            # Dni ponad limitem mogą pochodzić tylko sprzed jego wprowadzenia - zachowują swoją sumę
+            hours = func.sum(rows.c.hours)
+            columns.append('legacy_hours')
+            sums.append(case((hours > HOURS_CAP, hours)))
+
+        grouped = select(rows.c.entity_id, rows.c.day, *sums).group_by(rows.c.entity_id, rows.c.day)
+
+        connection.execute(delete(rollup_model))
+        connection.execute(insert(rollup_model).from_select(columns, grouped))
@@ -0,0 +1,318 @@
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy import and_, func, insert, literal, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from .. import db
+from ..models import Employee, EmployeeDailyRollup, Schedule, Workplace
+from .ledger import decode_cursor, encode_cursor, page_size
+from .rollups import RollupDeltas, apply_deltas
+
+
+SCHEDULE_FIELDS = (
+    'id', 'workplace_id', 'workplace_name', 'employee_id', 'employee_name', 'date', 'hours', 'created_at'
+)
+
+MAX_DAILY_HOURS = 24
+MAX_BULK_ENTRIES = 5000
+MAX_CLONE_DAYS = 92
+
+# Ograniczenie CHECK na employee_daily_rollups.hours
+HOURS_CAP_CONSTRAINT = 'ck_employee_daily_rollups_hours_cap'
+
+
+class DailyHoursExceeded(ValueError):
+    pass
+
+
+@contextmanager
+def daily_hours_cap():
+    # Równoległe zapisy przekraczające limit odrzuca baza - zamiana błędu na czytelny komunikat
+    try:
+        yield
+    except IntegrityError as e:
+        db.session.rollback()
+        constraint = getattr(getattr(e.orig, 'diag', None), 'constraint_name', None)
+        if constraint != HOURS_CAP_CONSTRAINT:
+            raise
+        raise DailyHoursExceeded(f'Łączna liczba godzin w danym dniu nie może przekraczać {MAX_DAILY_HOURS}')
+
+
+def daily_hours(employee_id, day):
+    # Odczyt jednego wiersza agregatu zamiast SUM po grafikach dnia
+    return db.session.execute(
+        select(EmployeeDailyRollup.hours).where(
+            EmployeeDailyRollup.employee_id == employee_id,
+            EmployeeDailyRollup.day == day
+        )
+    ).scalar() or 0.0
+
+
+def _schedule_columns(fields):
+    columns = {
+        'id': [Schedule.id],
+        'workplace_id': [Schedule.workplace_id],
+        'workplace_name': [Workplace.name.label('workplace_name')],
+        'employee_id': [Schedule.employee_id],
+        'employee_name': [Employee.first_name, Employee.last_name],
+        'date': [Schedule.date],
+        'hours': [Schedule.hours],
+        'created_at': [Schedule.created_at]
+    }
+    selected = []
+    for field in SCHEDULE_FIELDS:
+        # Kolumny kursora pobierane zawsze
+        if field in fields or field in ('id', 'date'):
+            selected.extend(columns[field])
+    return selected
+
+
+def schedule_page_query(manager_id, filters, after=None, limit=100, fields=SCHEDULE_FIELDS):
+    # Jedno zapytanie z projekcją potrzebnych kolumn - bez leniwego ładowania relacji
+    stmt = select(
+        *_schedule_columns(fields)
+    ).join(
+        Workplace, Schedule.workplace_id == Workplace.id
+    ).where(
+        Workplace.manager_id == manager_id
+    )
+
+    # Złączenie z pracownikami tylko, gdy potrzebne jest jego imię i nazwisko
+    if 'employee_name' in fields:
+        stmt = stmt.join(Employee, Schedule.employee_id == Employee.id)
+
+    if filters.get('start') is not None:
+        stmt = stmt.where(Schedule.date >= filters['start'])
+    if filters.get('end') is not None:
+        stmt = stmt.where(Schedule.date <= filters['end'])
+    if filters.get('employee_id') is not None:
+        stmt = stmt.where(Schedule.employee_id == filters['employee_id'])
+    if filters.get('workplace_id') is not None:
+        stmt = stmt.where(Schedule.workplace_id == filters['workplace_id'])
+    if after is not None:
+        stmt = stmt.where(tuple_(Schedule.date, Schedule.id) < tuple_(*after))
+
+    return stmt.order_by(Schedule.date.desc(), Schedule.id.desc()).limit(limit + 1)
+
+
+def serialize_schedule_row(row, fields=SCHEDULE_FIELDS):
+    item = {}
+    for field in fields:
+        if field == 'employee_name':
+            item[field] = f"{row.first_name} {row.last_name}"
+        else:
+            # Daty i UUID koduje dostawca JSON aplikacji (ISO 8601)
+            item[field] = getattr(row, field)
+    return item
+
+
+def schedule_page(manager_id, filters, cursor=None, limit=None, fields=None):
+    after = None
+    if cursor:
+        after_date, after_id = decode_cursor(cursor)
+        after = (after_date.date(), after_id)
+    limit = page_size(limit)
+    fields = fields or list(SCHEDULE_FIELDS)
+
+    rows = db.session.execute(schedule_page_query(manager_id, filters, after, limit, fields)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].date, rows[-1].id)
+
+    return {
+        'items': [serialize_schedule_row(row, fields) for row in rows],
+        'next_cursor': next_cursor
+    }
+
+
+def parse_schedule_entry(entry):
+    try:
+        values = {
+            'workplace_id': uuid.UUID(str(entry['workplace_id'])),
+            'employee_id': uuid.UUID(str(entry['employee_id'])),
+            'date': datetime.fromisoformat(str(entry['date'])).date(),
+            'hours': float(entry['hours'])
+        }
+    except KeyError as e:
+        raise ValueError(f'Brak wymaganego pola: {str(e)}')
+    except (TypeError, ValueError):
+        raise ValueError('Nieprawidłowe dane grafiku')
+
+    if values['hours'] <= 0 or values['hours'] > MAX_DAILY_HOURS:
+        raise ValueError('Nieprawidłowa liczba godzin')
+    return values
+
+
+def owned_ids(model, manager_id, ids):
+    if not ids:
+        return set()
+    return set(db.session.execute(
+        select(model.id).where(model.id.in_(ids), model.manager_id == manager_id)
+    ).scalars())
+
+
+def scheduled_hours(pairs):
+    # Godziny dla wszystkich par (pracownik, dzień) jednym zapytaniem po kluczu głównym agregatów
+    if not pairs:
+        return {}
+    rows = db.session.execute(
+        select(
+            EmployeeDailyRollup.employee_id, EmployeeDailyRollup.day, EmployeeDailyRollup.hours
+        ).where(
+            tuple_(EmployeeDailyRollup.employee_id, EmployeeDailyRollup.day).in_(list(pairs))
+        )
+    ).all()
+    return {(employee_id, day): float(hours) for employee_id, day, hours in rows}
+
+
+def bulk_create_schedules(manager_id, entries, atomic=True):
+    errors = []
+    parsed = []
+    for index, entry in enumerate(entries):
+        try:
+            parsed.append((index, parse_schedule_entry(entry)))
+        except ValueError as e:
+            errors.append({'index': index, 'error': str(e)})
+
+    workplaces = owned_ids(Workplace, manager_id, {values['workplace_id'] for _, values in parsed})
+    employees = owned_ids(Employee, manager_id, {values['employee_id'] for _, values in parsed})
+    totals = defaultdict(float, scheduled_hours({(values['employee_id'], values['date']) for _, values in parsed}))
+
+    accepted = []
+    for index, values in parsed:
+        if values['workplace_id'] not in workplaces:
+            errors.append({'index': index, 'error': 'Nie znaleziono miejsca pracy'})
+            continue
+        if values['employee_id'] not in employees:
+            errors.append({'index': index, 'error': 'Nie znaleziono pracownika'})
+            continue
+
+        # Limit dzienny liczony z godzinami już zapisanymi i wcześniejszymi wpisami z tego samego żądania
+        key = (values['employee_id'], values['date'])
+        if totals[key] + values['hours'] > MAX_DAILY_HOURS:
+            errors.append({
+                'index': index,
+                'error': f'Łączna liczba godzin w dniu {values["date"].isoformat()} nie może przekraczać '
+                         f'{MAX_DAILY_HOURS} (obecnie zaplanowane: {totals[key]}h)'
+            })
+            continue
+        totals[key] += values['hours']
+        accepted.append({'id': uuid.uuid4(), **values})
+
+    errors.sort(key=lambda error: error['index'])
+    if not accepted or (errors and atomic):
+        return [], errors
+
+    # Wielowierszowy INSERT Core - agregaty dzienne aktualizowane jawnie
+    with daily_hours_cap():
+        db.session.execute(insert(Schedule.__table__), accepted)
+        deltas = RollupDeltas()
+        for values in accepted:
+            deltas.add(Schedule, values)
+        apply_deltas(db.session.connection(), deltas)
+        db.session.commit()
+
+    return accepted, errors
+
+
+def clone_source_query(manager_id, source_start, source_end, offset, filters):
+    stmt = select(
+        Schedule.workplace_id,
+        Schedule.employee_id,
+        (Schedule.date + offset).label('date'),
+        Schedule.hours
+    ).join(
+        Workplace, Schedule.workplace_id == Workplace.id
+    ).where(
+        Workplace.manager_id == manager_id,
+        Schedule.date >= source_start,
+        Schedule.date <= source_end
+    )
+
+    if filters.get('employee_id') is not None:
+        stmt = stmt.where(Schedule.employee_id == filters['employee_id'])
+    if filters.get('workplace_id') is not None:
+        stmt = stmt.where(Schedule.workplace_id == filters['workplace_id'])
+    return stmt
+
+
+def clone_conflicts_query(source):
+    # Godziny kopiowane na każdą parę (pracownik, dzień docelowy) + godziny już zapisane w agregacie
+    planned = select(
+        source.c.employee_id,
+        source.c.date,
+        func.sum(source.c.hours).label('hours')
+    ).group_by(
+        source.c.employee_id, source.c.date
+    ).subquery()
+
+    scheduled = func.coalesce(EmployeeDailyRollup.hours, 0)
+    return select(
+        planned.c.employee_id,
+        planned.c.date,
+        planned.c.hours,
+        scheduled.label('scheduled')
+    ).outerjoin(
+        EmployeeDailyRollup,
+        and_(EmployeeDailyRollup.employee_id == planned.c.employee_id, EmployeeDailyRollup.day == planned.c.date)
+    ).where(
+        planned.c.hours + scheduled > MAX_DAILY_HOURS
+    ).order_by(
+        planned.c.date, planned.c.employee_id
+    )
+
+
+def clone_schedules(manager_id, source_start, source_end, target_start, filters):
+    if source_end < source_start:
+        raise ValueError('Nieprawidłowy zakres dat')
+    if (source_end - source_start).days >= MAX_CLONE_DAYS:
+        raise ValueError(f'Maksymalny zakres kopiowania to {MAX_CLONE_DAYS} dni')
+    offset = (target_start - source_start).days
+    if offset == 0:
+        raise ValueError('Data docelowa musi różnić się od początkowej')
+
+    source = clone_source_query(manager_id, source_start, source_end, offset, filters)
+
+    conflicts = db.session.execute(clone_conflicts_query(source.subquery())).all()
+    if conflicts:
+        return 0, [
+            {
+                'employee_id': row.employee_id,
+                'date': row.date,
+                'hours': float(row.hours),
+                'scheduled': float(row.scheduled)
+            }
+            for row in conflicts
+        ]
+
+    # Jedno INSERT ... SELECT; RETURNING dostarcza wartości do aktualizacji agregatów
+    now = datetime.utcnow()
+    source = source.subquery()
+    stmt = insert(Schedule.__table__).from_select(
+        ['id', 'workplace_id', 'employee_id', 'date', 'hours', 'created_at', 'updated_at'],
+        select(
+            func.gen_random_uuid(),
+            source.c.workplace_id,
+            source.c.employee_id,
+            source.c.date,
+            source.c.hours,
+            literal(now),
+            literal(now)
+        )
+    ).returning(
+        Schedule.workplace_id, Schedule.employee_id, Schedule.date, Schedule.hours
+    )
+
+    with daily_hours_cap():
+        rows = db.session.execute(stmt).all()
+        deltas = RollupDeltas()
+        for row in rows:
+            deltas.add(Schedule, row._asdict())
+        if deltas:
+            apply_deltas(db.session.connection(), deltas)
+        db.session.commit()
+
+    return len(rows), []
@@ -0,0 +1,166 @@
+from sqlalchemy import DateTime, Float, String, cast, desc, func, literal, null, or_, select, union_all
+from .. import db
+from ..models import Employee, EmployeeCost, EmployeeRevenue, Workplace, WorkplaceCost, WorkplaceRevenue
+
+# Rodzaje wyników wyszukiwania, w kolejności prezentacji przy równym dopasowaniu
+SEARCH_TYPES = (
+    'employee', 'workplace', 'workplace_cost', 'employee_cost', 'workplace_revenue', 'employee_revenue'
+)
+
+# Indeksy trigramowe są używane dopiero od 3 znaków wzorca
+MIN_QUERY_LENGTH = 3
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+
+class InvalidSearch(ValueError):
+    pass
+
+
+def search_limit(value):
+    if value is None:
+        return DEFAULT_SEARCH_LIMIT
+    return max(1, min(int(value), MAX_SEARCH_LIMIT))
+
+
+def like_pattern(query):
+    escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def _matches(columns, pattern):
+    # ILIKE '%...%' na kolumnach z indeksem GIN gin_trgm_ops
+    return or_(*[column.ilike(pattern, escape='\\') for column in columns])
+
+
+def _score(columns, query):
+    return func.greatest(*[func.similarity(func.coalesce(column, ''), query) for column in columns])
+
+
+def _result(result_type, id_column, label, detail, date, amount, score):
+    return select(
+        literal(result_type).label('type'),
+        id_column.label('id'),
+        label.label('label'),
+        detail.label('detail'),
+        date.label('date'),
+        amount.label('amount'),
+        score.label('score')
+    )
+
+
+def _employee_branch(manager_id, query, pattern):
+    columns = (Employee.first_name, Employee.last_name, Employee.email)
+    return _result(
+        'employee',
+        Employee.id,
+        Employee.first_name + ' ' + Employee.last_name,
+        Employee.email,
+        cast(null(), DateTime),
+        cast(null(), Float),
+        _score(columns, query)
+    ).where(
+        Employee.manager_id == manager_id,
+        _matches(columns, pattern)
+    )
+
+
+def _workplace_branch(manager_id, query, pattern):
+    columns = (Workplace.name, Workplace.location)
+    return _result(
+        'workplace',
+        Workplace.id,
+        Workplace.name,
+        Workplace.location,
+        cast(null(), DateTime),
+        cast(null(), Float),
+        _score(columns, query)
+    ).where(
+        Workplace.manager_id == manager_id,
+        _matches(columns, pattern)
+    )
+
+
+def _workplace_ledger_branch(result_type, model, manager_id, query, pattern):
+    return _result(
+        result_type,
+        model.id,
+        model.description,
+        Workplace.name,
+        model.date,
+        model.amount,
+        _score((model.description,), query)
+    ).join(
+        Workplace, model.workplace_id == Workplace.id
+    ).where(
+        Workplace.manager_id == manager_id,
+        _matches((model.description,), pattern)
+    )
+
+
+def _employee_ledger_branch(result_type, model, manager_id, query, pattern):
+    return _result(
+        result_type,
+        model.id,
+        model.description,
+        cast(Employee.first_name + ' ' + Employee.last_name, String),
+        model.date,
+        model.amount,
+        _score((model.description,), query)
+    ).join(
+        Employee, model.employee_id == Employee.id
+    ).where(
+        Employee.manager_id == manager_id,
+        _matches((model.description,), pattern)
+    )
+
+
+def _branches(manager_id, query, pattern):
+    return {
+        'employee': lambda: _employee_branch(manager_id, query, pattern),
+        'workplace': lambda: _workplace_branch(manager_id, query, pattern),
+        'workplace_cost': lambda: _workplace_ledger_branch('workplace_cost', WorkplaceCost, manager_id, query, pattern),
+        'employee_cost': lambda: _employee_ledger_branch('employee_cost', EmployeeCost, manager_id, query, pattern),
+        'workplace_revenue': lambda: _workplace_ledger_branch('workplace_revenue', WorkplaceRevenue, manager_id, query, pattern),
+        'employee_revenue': lambda: _employee_ledger_branch('employee_revenue', EmployeeRevenue, manager_id, query, pattern)
+    }
+
+
+def search_query(manager_id, query, types=SEARCH_TYPES, limit=DEFAULT_SEARCH_LIMIT):
+    pattern = like_pattern(query)
+    builders = _branches(manager_id, query, pattern)
+
+    branches = []
+    for result_type in SEARCH_TYPES:
+        if result_type not in types:
+            continue
+        # Ranking i limit w każdej gałęzi - żadna tabela nie zwraca więcej niż potrzeba
+        branch = builders[result_type]()
+        branch = branch.order_by(desc('score')).limit(limit)
+        branches.append(select(branch.subquery()))
+
+    merged = union_all(*branches).subquery()
+    return select(merged).order_by(merged.c.score.desc(), merged.c.label).limit(limit)
+
+
+def search(manager_id, query, types=None, limit=None):
+    query = (query or '').strip()
+    if len(query) < MIN_QUERY_LENGTH:
+        raise InvalidSearch(f'Zapytanie musi mieć co najmniej {MIN_QUERY_LENGTH} znaki')
+
+    rows = db.session.execute(
+        search_query(manager_id, query, types or SEARCH_TYPES, search_limit(limit))
+    ).all()
+
+    return [
+        {
+            'type': row.type,
+            'id': row.id,
+            'label': row.label,
+            'detail': row.detail,
+            'date': row.date,
+            'amount': float(row.amount) if row.amount is not None else None,
+            'score': round(float(row.score), 4)
+        }
+        for row in rows
+    ]
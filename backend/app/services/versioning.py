@@ -0,0 +1,110 @@
+import hashlib
+from datetime import date, datetime
+from flask import current_app, g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from .. import db, report_cache
+from ..models import DataVersion
+
+WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+
+def data_version(manager_id):
+    # Jedno wyszukanie po kluczu głównym
+    return db.session.execute(
+        select(DataVersion.version).where(DataVersion.manager_id == manager_id)
+    ).scalar() or 0
+
+
+def bump_data_version(manager_id, session=None):
+    table = DataVersion.__table__
+    stmt = insert(table).values(manager_id=manager_id, version=1, updated_at=datetime.utcnow())
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['manager_id'],
+        set_={'version': table.c.version + 1, 'updated_at': stmt.excluded.updated_at}
+    )
+    (session or db.session).execute(stmt)
+
+
+def _request_manager_id():
+    # Manager z tokenu bieżącego żądania zapisu; poza żądaniem (CLI, zadania w tle) brak
+    if not has_request_context() or request.method not in WRITE_METHODS:
+        return None
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        # Żądanie bez weryfikacji tokenu, np. logowanie
+        return None
+
+
+@event.listens_for(Session, 'after_flush')
+def mark_flushed_changes(session, flush_context):
+    if session.new or session.dirty or session.deleted:
+        session.info['data_changed'] = True
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def mark_executed_changes(orm_execute_state):
+    # Zapisy Core (import, operacje zbiorcze) omijają flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['data_changed'] = True
+
+
+@event.listens_for(Session, 'before_commit')
+def bump_on_commit(session):
+    # Nowa wersja danych w tej samej transakcji co zapis - ETag i cache raportów nie mogą
+    # wyprzedzić zatwierdzonych danych ani pominąć zapisu przy błędzie osobnego commit
+    manager_id = _request_manager_id()
+    if manager_id is None or g.get('batch'):
+        # W żądaniu zbiorczym wersja jest podbijana raz, przy zatwierdzeniu całej paczki
+        return
+
+    # before_commit poprzedza końcowy flush - zmiany oczekujące muszą zostać zarejestrowane
+    session.flush()
+    if session.info.pop('data_changed', False):
+        bump_data_version(manager_id, session)
+        session.info.pop('data_changed', None)
+
+
+def make_etag(manager_id, version):
+    # Wersja danych + adres zasobu; miesiąc, bo listy zawierają sumy bieżącego miesiąca
+    digest = hashlib.sha1(
+        f'{manager_id}|{request.full_path}|{date.today():%Y-%m}'.encode()
+    ).hexdigest()[:16]
+    return f'{version}-{digest}'
+
+
+def not_modified():
+    # Hook before_request: odpowiedz 304 zanim zapytania sięgną do tabel z danymi
+    if request.method != 'GET':
+        return None
+
+    try:
+        verify_jwt_in_request()
+    except Exception:
+        # Błąd autoryzacji obsłuży dekorator jwt_required widoku
+        return None
+
+    manager_id = get_jwt_identity()
+    g.etag = make_etag(manager_id, data_version(manager_id))
+
+    if request.if_none_match.contains_weak(g.etag):
+        return current_app.response_class(status=304)
+    return None
+
+
+def track_changes(response):
+    # Hook after_request: ETag dla odczytów, czyszczenie cache raportów po udanym zapisie
+    if request.method == 'GET':
+        etag = g.get('etag')
+        if etag and response.status_code in (200, 304):
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = 'private, no-cache'
+    elif request.method in WRITE_METHODS and response.status_code < 400 and not g.get('batch'):
+        # Wersję danych podbił już commit widoku; wpisy cache starej wersji tylko zajmują miejsce
+        manager_id = get_jwt_identity()
+        if manager_id is not None:
+            report_cache.discard(manager_id)
+    return response
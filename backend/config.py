@@ -24,6 +24,23 @@ class Config:
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'dev-secret-key')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     
+    # Kolejka raportów w tle
+    REPORT_JOB_WORKERS = int(os.environ.get('REPORT_JOB_WORKERS', 2))
+    REPORT_JOB_MAX_PENDING = int(os.environ.get('REPORT_JOB_MAX_PENDING', 20))
+    REPORT_JOB_TTL = int(os.environ.get('REPORT_JOB_TTL', 3600))
+    REPORT_JOB_DIR = os.environ.get('REPORT_JOB_DIR')
+    REPORT_SECTION_WORKERS = int(os.environ.get('REPORT_SECTION_WORKERS', 4))
+    REPORT_SECTION_QUEUE_SIZE = int(os.environ.get('REPORT_SECTION_QUEUE_SIZE', 1000))
+    
+    # Cache wyników raportów
+    REPORT_CACHE_SIZE = int(os.environ.get('REPORT_CACHE_SIZE', 256))
+    
+    # Kompresja odpowiedzi
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 500))
+    COMPRESSION_LEVEL = int(os.environ.get('COMPRESSION_LEVEL', 6))
+    COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 4))
+    
     # API
     API_TITLE = 'Work Management API'
     API_VERSION = 'v1'
@@ -1,4 +1,5 @@
 -- Skrypt jest wykonywany tylko przy pierwszym uruchomieniu kontenera z pustą bazą danych
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 -- Dodaj tutaj inne inicjalizacyjne zapytania SQL, jeśli są potrzebne 
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""initial schema
+
+Revision ID: 0001_initial_schema
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_initial_schema'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def create_table_if_missing(name, *columns):
+    # Bazy utworzone wcześniej przez db.create_all() mają już te tabele
+    if not sa.inspect(op.get_bind()).has_table(name):
+        op.create_table(name, *columns)
+
+
+def upgrade():
+    create_table_if_missing(
+        'users',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False),
+        sa.Column('password_hash', sa.String(length=255), nullable=False),
+        sa.Column('first_name', sa.String(length=50), nullable=False),
+        sa.Column('last_name', sa.String(length=50), nullable=False),
+        sa.Column('role', sa.String(length=20), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email')
+    )
+    create_table_if_missing(
+        'employees',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('manager_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False),
+        sa.Column('first_name', sa.String(length=50), nullable=False),
+        sa.Column('last_name', sa.String(length=50), nullable=False),
+        sa.Column('phone', sa.String(length=20), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['manager_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email')
+    )
+    create_table_if_missing(
+        'workplaces',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('manager_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('location', sa.String(length=200), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['manager_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    create_table_if_missing(
+        'workplace_assignments',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('workplace_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('employee_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('date', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id']),
+        sa.ForeignKeyConstraint(['workplace_id'], ['workplaces.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    for table, key, key_table, key_nullable in (
+        ('employee_costs', 'employee_id', 'employees', False),
+        ('employee_revenues', 'employee_id', 'employees', False),
+        ('workplace_costs', 'workplace_id', 'workplaces', False),
+        ('workplace_revenues', 'workplace_id', 'workplaces', True)
+    ):
+        create_table_if_missing(
+            table,
+            sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column(key, postgresql.UUID(as_uuid=True), nullable=key_nullable),
+            sa.Column('description', sa.String(length=200), nullable=True),
+            sa.Column('amount', sa.Float(), nullable=False),
+            sa.Column('date', sa.DateTime(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint([key], [f'{key_table}.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+    create_table_if_missing(
+        'schedules',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('workplace_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('employee_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('hours', sa.Float(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id']),
+        sa.ForeignKeyConstraint(['workplace_id'], ['workplaces.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('schedules')
+    op.drop_table('workplace_revenues')
+    op.drop_table('workplace_costs')
+    op.drop_table('employee_revenues')
+    op.drop_table('employee_costs')
+    op.drop_table('workplace_assignments')
+    op.drop_table('workplaces')
+    op.drop_table('employees')
+    op.drop_table('users')
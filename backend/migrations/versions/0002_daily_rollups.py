@@ -0,0 +1,72 @@
+"""daily rollups
+
+Revision ID: 0002_daily_rollups
+Revises: 0001_initial_schema
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_daily_rollups'
+down_revision = '0001_initial_schema'
+branch_labels = None
+depends_on = None
+
+ROLLUPS = (
+    ('employee_daily_rollups', 'employee_id', 'employees', '''
+        SELECT employee_id, date::date, amount, 0, 0, 1, 0, 0 FROM employee_costs
+        UNION ALL
+        SELECT employee_id, date::date, 0, amount, 0, 0, 1, 0 FROM employee_revenues
+        UNION ALL
+        SELECT employee_id, date, 0, 0, hours, 0, 0, 1 FROM schedules
+    '''),
+    ('workplace_daily_rollups', 'workplace_id', 'workplaces', '''
+        SELECT workplace_id, date::date, amount, 0, 0, 1, 0, 0 FROM workplace_costs
+        UNION ALL
+        SELECT workplace_id, date::date, 0, amount, 0, 0, 1, 0 FROM workplace_revenues
+        WHERE workplace_id IS NOT NULL
+        UNION ALL
+        SELECT workplace_id, date, 0, 0, hours, 0, 0, 1 FROM schedules
+    ''')
+)
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    for table, key, key_table, source_rows in ROLLUPS:
+        if not inspector.has_table(table):
+            op.create_table(
+                table,
+                sa.Column(key, postgresql.UUID(as_uuid=True), nullable=False),
+                sa.Column('day', sa.Date(), nullable=False),
+                sa.Column('costs', sa.Float(), nullable=False),
+                sa.Column('revenues', sa.Float(), nullable=False),
+                sa.Column('hours', sa.Float(), nullable=False),
+                sa.Column('cost_count', sa.Integer(), nullable=False),
+                sa.Column('revenue_count', sa.Integer(), nullable=False),
+                sa.Column('schedule_count', sa.Integer(), nullable=False),
+                sa.ForeignKeyConstraint([key], [f'{key_table}.id'], ondelete='CASCADE'),
+                sa.PrimaryKeyConstraint(key, 'day')
+            )
+
+        # Wypełnij agregaty istniejącymi danymi - również gdy tabela powstała wcześniej
+        # przez db.create_all (tryb deweloperski) i wciąż jest pusta
+        op.execute(f'''
+            INSERT INTO {table} ({key}, day, costs, revenues, hours, cost_count, revenue_count, schedule_count)
+            SELECT entity_id, day, SUM(costs), SUM(revenues), SUM(hours),
+                   SUM(cost_count), SUM(revenue_count), SUM(schedule_count)
+            FROM ({source_rows}) AS source_rows (entity_id, day, costs, revenues, hours,
+                                                 cost_count, revenue_count, schedule_count)
+            WHERE NOT EXISTS (SELECT 1 FROM {table})
+            GROUP BY entity_id, day
+        ''')
+
+
+def downgrade():
+    op.drop_table('workplace_daily_rollups')
+    op.drop_table('employee_daily_rollups')
@@ -0,0 +1,38 @@
+"""ledger and schedule indexes
+
+Revision ID: 0003_ledger_indexes
+Revises: 0002_daily_rollups
+Create Date: 2026-10-18 09:20:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_ledger_indexes'
+down_revision = '0002_daily_rollups'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('ix_employees_manager_id', 'employees', ['manager_id']),
+    ('ix_workplaces_manager_id', 'workplaces', ['manager_id']),
+    ('ix_employee_costs_employee_id_date', 'employee_costs', ['employee_id', 'date']),
+    ('ix_employee_revenues_employee_id_date', 'employee_revenues', ['employee_id', 'date']),
+    ('ix_workplace_costs_workplace_id_date', 'workplace_costs', ['workplace_id', 'date']),
+    ('ix_workplace_revenues_workplace_id_date', 'workplace_revenues', ['workplace_id', 'date']),
+    ('ix_schedules_employee_id_date', 'schedules', ['employee_id', 'date']),
+    ('ix_schedules_workplace_id_date', 'schedules', ['workplace_id', 'date']),
+    ('ix_workplace_assignments_workplace_id_date', 'workplace_assignments', ['workplace_id', 'date']),
+    ('ix_workplace_assignments_employee_id_date', 'workplace_assignments', ['employee_id', 'date'])
+)
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
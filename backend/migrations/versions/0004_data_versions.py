@@ -0,0 +1,35 @@
+"""per-manager data versions
+
+Revision ID: 0004_data_versions
+Revises: 0003_ledger_indexes
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_data_versions'
+down_revision = '0003_ledger_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('data_versions'):
+        return
+
+    op.create_table(
+        'data_versions',
+        sa.Column('manager_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['manager_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('manager_id')
+    )
+
+
+def downgrade():
+    op.drop_table('data_versions')
@@ -0,0 +1,41 @@
+"""trigram search indexes
+
+Revision ID: 0005_search_indexes
+Revises: 0004_data_versions
+Create Date: 2026-10-18 09:50:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_search_indexes'
+down_revision = '0004_data_versions'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('ix_employees_first_name_trgm', 'employees', 'first_name'),
+    ('ix_employees_last_name_trgm', 'employees', 'last_name'),
+    ('ix_employees_email_trgm', 'employees', 'email'),
+    ('ix_workplaces_name_trgm', 'workplaces', 'name'),
+    ('ix_workplaces_location_trgm', 'workplaces', 'location'),
+    ('ix_employee_costs_description_trgm', 'employee_costs', 'description'),
+    ('ix_employee_revenues_description_trgm', 'employee_revenues', 'description'),
+    ('ix_workplace_costs_description_trgm', 'workplace_costs', 'description'),
+    ('ix_workplace_revenues_description_trgm', 'workplace_revenues', 'description')
+)
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in INDEXES:
+        op.create_index(
+            name, table, [column], unique=False, if_not_exists=True,
+            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}
+        )
+
+
+def downgrade():
+    for name, table, column in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,39 @@
+"""daily hours cap constraint
+
+Revision ID: 0006_daily_hours_cap
+Revises: 0005_search_indexes
+Create Date: 2026-10-18 10:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_daily_hours_cap'
+down_revision = '0005_search_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Dni zaplanowane ponad limit przed jego wprowadzeniem zachowują dotychczasową sumę jako granicę -
+    # inaczej każdy zapis kosztu lub przychodu w takim dniu naruszałby ograniczenie
+    op.add_column('employee_daily_rollups', sa.Column('legacy_hours', sa.Float(), nullable=True))
+    op.execute('UPDATE employee_daily_rollups SET legacy_hours = hours WHERE hours > 24.0001')
+
+    # NOT VALID - krótka blokada ACCESS EXCLUSIVE, bez przeglądania tabeli
+    op.execute(
+        'ALTER TABLE employee_daily_rollups ADD CONSTRAINT ck_employee_daily_rollups_hours_cap '
+        'CHECK (hours <= GREATEST(24.0001, legacy_hours)) NOT VALID'
+    )
+
+    # VALIDATE po zatwierdzeniu powyższych zmian, we własnej transakcji - blokada SHARE UPDATE EXCLUSIVE
+    # nie wstrzymuje zapisów na czas sprawdzania istniejących wierszy
+    with op.get_context().autocommit_block():
+        op.execute('ALTER TABLE employee_daily_rollups VALIDATE CONSTRAINT ck_employee_daily_rollups_hours_cap')
+
+
+def downgrade():
+    op.drop_constraint('ck_employee_daily_rollups_hours_cap', 'employee_daily_rollups', type_='check')
+    op.drop_column('employee_daily_rollups', 'legacy_hours')
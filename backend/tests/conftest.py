@@ -0,0 +1,82 @@
+import os
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from flask_jwt_extended import create_access_token
+from config import Config
+
+# Testy bazodanowe wymagają PostgreSQL - adres bazy testowej podaje zmienna TEST_DATABASE_URL
+TEST_DATABASE_URL = os.environ.get('TEST_DATABASE_URL')
+
+
+class TestConfig(Config):
+    TESTING = True
+    DEBUG = False
+    DEVELOPMENT = False
+    SQLALCHEMY_DATABASE_URI = TEST_DATABASE_URL
+    JWT_SECRET_KEY = 'test-secret-key-with-at-least-32-bytes'
+    COMPRESSION_ENABLED = False
+
+
+def _create_schema(db):
+    with db.engine.begin() as connection:
+        try:
+            with connection.begin_nested():
+                connection.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+            trigram = True
+        except DBAPIError:
+            trigram = False
+
+    if not trigram:
+        # Serwer bez pg_trgm - pomijamy tylko indeksy trigramowe wyszukiwarki
+        for table in db.metadata.tables.values():
+            for index in list(table.indexes):
+                if index.dialect_options['postgresql']['using'] == 'gin':
+                    table.indexes.discard(index)
+
+    db.drop_all()
+    db.create_all()
+
+
+@pytest.fixture(scope='session')
+def app():
+    if not TEST_DATABASE_URL:
+        pytest.skip('Ustaw TEST_DATABASE_URL, aby uruchomić testy bazodanowe')
+
+    from app import create_app, db
+    app = create_app(TestConfig)
+    with app.app_context():
+        _create_schema(db)
+    yield app
+    with app.app_context():
+        db.drop_all()
+
+
+@pytest.fixture
+def database(app):
+    from app import db, report_cache
+    ctx = app.app_context()
+    ctx.push()
+    yield db
+    db.session.remove()
+    tables = ', '.join(table.name for table in db.metadata.sorted_tables)
+    with db.engine.begin() as connection:
+        connection.execute(text(f'TRUNCATE {tables} CASCADE'))
+    report_cache.entries.clear()
+    ctx.pop()
+
+
+@pytest.fixture
+def client(app, database):
+    return app.test_client()
+
+
+@pytest.fixture
+def manager(database):
+    from .factories import create_user
+    return create_user()
+
+
+@pytest.fixture
+def auth_headers(manager):
+    return {'Authorization': f'Bearer {create_access_token(identity=str(manager.id))}'}
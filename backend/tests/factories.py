@@ -0,0 +1,89 @@
+import uuid
+from datetime import date, datetime
+from app import db
+from app.models import (
+    Employee, EmployeeCost, EmployeeRevenue, Schedule, User, Workplace, WorkplaceCost, WorkplaceRevenue
+)
+
+
+def _unique():
+    return uuid.uuid4().hex[:8]
+
+
+def create_user(**values):
+    user = User(
+        email=values.pop('email', f'manager-{_unique()}@example.com'),
+        first_name=values.pop('first_name', 'Jan'),
+        last_name=values.pop('last_name', 'Kowalski'),
+        **values
+    )
+    user.set_password('haslo123')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def create_employee(manager, **values):
+    employee = Employee(
+        manager_id=manager.id,
+        email=values.pop('email', f'employee-{_unique()}@example.com'),
+        first_name=values.pop('first_name', 'Anna'),
+        last_name=values.pop('last_name', f'Nowak-{_unique()}'),
+        **values
+    )
+    db.session.add(employee)
+    db.session.commit()
+    return employee
+
+
+def create_workplace(manager, **values):
+    workplace = Workplace(
+        manager_id=manager.id,
+        name=values.pop('name', f'Miejsce {_unique()}'),
+        **values
+    )
+    db.session.add(workplace)
+    db.session.commit()
+    return workplace
+
+
+def create_entry(model, **values):
+    # Wpis księgi przez ORM - agregaty dzienne aktualizuje nasłuch after_flush
+    entry = model(
+        description=values.pop('description', 'Wpis testowy'),
+        amount=values.pop('amount', 100.0),
+        date=values.pop('date', datetime(2024, 1, 15)),
+        **values
+    )
+    db.session.add(entry)
+    db.session.commit()
+    return entry
+
+
+def create_workplace_cost(workplace, **values):
+    return create_entry(WorkplaceCost, workplace_id=workplace.id, **values)
+
+
+def create_workplace_revenue(workplace, **values):
+    return create_entry(WorkplaceRevenue, workplace_id=workplace.id, **values)
+
+
+def create_employee_cost(employee, **values):
+    return create_entry(EmployeeCost, employee_id=employee.id, **values)
+
+
+def create_employee_revenue(employee, **values):
+    return create_entry(EmployeeRevenue, employee_id=employee.id, **values)
+
+
+def create_schedule(workplace, employee, **values):
+    schedule = Schedule(
+        workplace_id=workplace.id,
+        employee_id=employee.id,
+        date=values.pop('date', date(2024, 1, 15)),
+        hours=values.pop('hours', 8.0),
+        **values
+    )
+    db.session.add(schedule)
+    db.session.commit()
+    return schedule
@@ -0,0 +1,57 @@
+import pytest
+from .factories import create_workplace
+
+
+def cost_request(workplace, amount=100.0):
+    return {'method': 'POST', 'path': '/api/costs', 'body': {
+        'type': 'workplace', 'workplace_id': str(workplace.id), 'description': 'Czynsz',
+        'amount': amount, 'date': '2024-01-15T00:00:00'
+    }}
+
+
+def test_sub_requests_see_earlier_writes_of_the_batch(client, manager, auth_headers):
+    workplace = create_workplace(manager)
+
+    response = client.post('/api/batch', headers=auth_headers, json={'requests': [
+        cost_request(workplace),
+        {'method': 'GET', 'path': f'/api/costs?workplace_id={workplace.id}&fields=amount'}
+    ]})
+
+    results = response.get_json()['results']
+    assert response.status_code == 200
+    assert [result['status'] for result in results] == [201, 200]
+    assert [item['amount'] for item in results[1]['body']['items']] == [100.0]
+
+
+def test_failed_atomic_batch_rolls_back(client, manager, auth_headers):
+    workplace = create_workplace(manager)
+
+    response = client.post('/api/batch', headers=auth_headers, json={'requests': [
+        cost_request(workplace),
+        {'method': 'POST', 'path': '/api/costs', 'body': {'type': 'nieznany'}}
+    ]})
+
+    assert response.status_code == 400
+    assert response.get_json()['rolled_back'] is True
+    assert client.get('/api/costs', headers=auth_headers).get_json()['items'] == []
+
+
+@pytest.mark.parametrize('path', ['/api/reports/stats', '/api/batch'])
+def test_batch_rejects_excluded_paths(client, manager, auth_headers, path):
+    response = client.post('/api/batch', headers=auth_headers, json={'requests': [
+        {'method': 'POST', 'path': path, 'body': {}}
+    ]})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('atomic', ['false', 0])
+def test_batch_rejects_non_boolean_atomic(client, manager, auth_headers, atomic):
+    workplace = create_workplace(manager)
+
+    response = client.post('/api/batch', headers=auth_headers, json={
+        'requests': [cost_request(workplace)], 'atomic': atomic
+    })
+
+    assert response.status_code == 400
+    assert 'atomic' in response.get_json()['error']
@@ -0,0 +1,41 @@
+import zlib
+from werkzeug.test import Client
+from werkzeug.wrappers import Response
+from app.compression import CompressionMiddleware
+
+CHUNKS = [f'{{"id": {index}, "description": "Wpis testowy {index}"}}\n'.encode() for index in range(200)]
+
+
+def gzip(data, level=6):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def client(response):
+    return Client(CompressionMiddleware(response, min_size=500, level=6), Response)
+
+
+def test_buffered_response_is_compressed_in_one_block():
+    body = b''.join(CHUNKS)
+    app = Response(CHUNKS, mimetype='application/json', headers={'Content-Length': str(len(body))})
+
+    response = client(app).get('/', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.data == gzip(body)
+    assert response.headers['Content-Length'] == str(len(response.data))
+
+
+def test_streamed_response_is_flushed_per_chunk():
+    app = Response(iter(CHUNKS), mimetype='application/x-ndjson')
+
+    response = client(app).get('/', headers={'Accept-Encoding': 'gzip'}, buffered=False)
+    parts = iter(response.response)
+    decompressor = zlib.decompressobj(31)
+    first = decompressor.decompress(next(parts))
+    rest = b''.join(decompressor.decompress(part) for part in parts)
+
+    assert 'Content-Length' not in response.headers
+    # Pierwszy fragment da się rozpakować bez czekania na resztę odpowiedzi
+    assert first.startswith(b''.join(CHUNKS)[:500])
+    assert first + rest == b''.join(CHUNKS)
@@ -0,0 +1,88 @@
+import io
+import time
+import tracemalloc
+import uuid
+import pytest
+from openpyxl import load_workbook
+from sqlalchemy import insert
+from app.models import Employee
+from .factories import create_employee, create_schedule, create_workplace
+
+EXCEL_PAYLOAD = {'start_date': '2024-01-01', 'end_date': '2024-01-31', 'type': 'all'}
+
+
+def seed_employees(database, manager, count, chunk=10000):
+    # Bezpośredni INSERT Core - szybkie przygotowanie dużego raportu
+    for offset in range(0, count, chunk):
+        database.session.execute(insert(Employee.__table__), [
+            {
+                'id': uuid.uuid4(),
+                'manager_id': manager.id,
+                'email': f'bench-{uuid.uuid4().hex}@example.com',
+                'first_name': 'Jan',
+                'last_name': f'Nowak {offset + index:06d}'
+            }
+            for index in range(min(chunk, count - offset))
+        ])
+    database.session.commit()
+
+
+def test_excel_report_contains_both_sheets(client, manager, auth_headers):
+    workplace = create_workplace(manager, name='Magazyn')
+    employee = create_employee(manager)
+    create_schedule(workplace, employee)
+
+    response = client.post('/api/reports/excel', json=EXCEL_PAYLOAD, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert 'Server-Timing' in response.headers
+    workbook = load_workbook(io.BytesIO(response.data), read_only=True)
+    assert workbook.sheetnames == ['Miejsca pracy', 'Pracownicy']
+    employee_rows = list(workbook['Pracownicy'].iter_rows(values_only=True))
+    assert len(employee_rows) == 2
+    assert employee_rows[1][1] == 'Magazyn'
+
+
+def export_excel(client, auth_headers):
+    started_at = time.perf_counter()
+    response = client.post('/api/reports/excel', json=EXCEL_PAYLOAD, headers=auth_headers, buffered=False)
+    chunks = iter(response.response)
+    first_chunk = next(chunks)
+    ttfb = time.perf_counter() - started_at
+    size = len(first_chunk) + sum(len(chunk) for chunk in chunks)
+    total = time.perf_counter() - started_at
+    response.close()
+    assert response.status_code == 200
+    return ttfb, total, size
+
+
+def traced_peak(client, auth_headers):
+    # Osobny przebieg - tracemalloc spowalnia generowanie kilkukrotnie i zafałszowałby czasy
+    tracemalloc.start()
+    try:
+        _, _, size = export_excel(client, auth_headers)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak, size
+
+
+@pytest.mark.benchmark
+def test_excel_export_memory_stays_flat(client, database, manager, auth_headers):
+    results = {}
+    seeded = 0
+    for rows in (10000, 100000):
+        seed_employees(database, manager, rows - seeded)
+        seeded = rows
+        ttfb, total, _ = export_excel(client, auth_headers)
+        peak, size = traced_peak(client, auth_headers)
+        results[rows] = (ttfb, total, peak, size)
+
+    for rows, (ttfb, total, peak, size) in results.items():
+        print(f'\n{rows:>7} wierszy: TTFB {ttfb * 1000:.0f} ms, całość {total * 1000:.0f} ms, '
+              f'szczyt pamięci {peak / 1024 / 1024:.1f} MiB (w tym plik {size / 1024 / 1024:.1f} MiB)')
+
+    # Gotowy plik jest trzymany w SpooledTemporaryFile (do 8 MiB w pamięci), poza nim pamięć
+    # robocza nie może rosnąć z liczbą wierszy
+    working = {rows: peak - size for rows, (_, _, peak, size) in results.items()}
+    assert working[100000] < working[10000] * 2
@@ -0,0 +1,92 @@
+import json
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+import pytest
+from flask import Flask
+from sqlalchemy import insert
+from app import json_provider
+from app.json_provider import FastJSONProvider
+from app.models import EmployeeCost, WorkplaceCost
+from app.services.ledger import ledger_page_query, serialize_ledger_row
+from .factories import create_employee, create_workplace
+
+SAMPLE = {
+    'day': date(2024, 1, 15),
+    'created_at': datetime(2024, 1, 15, 10, 30, 5, 123456),
+    'updated_at': datetime(2024, 1, 15, 10, 30, tzinfo=timezone.utc),
+    'id': uuid.UUID('7f1c2b3a-4d5e-4f60-8a9b-0c1d2e3f4a5b'),
+    'amount': Decimal('1234.50')
+}
+
+EXPECTED = {
+    'day': '2024-01-15',
+    'created_at': '2024-01-15T10:30:05.123456',
+    'updated_at': '2024-01-15T10:30:00+00:00',
+    'id': '7f1c2b3a-4d5e-4f60-8a9b-0c1d2e3f4a5b',
+    'amount': '1234.50'
+}
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def json_app(request, monkeypatch):
+    if request.param == 'json':
+        # Ścieżka awaryjna bez orjson musi dawać identyczny wynik
+        monkeypatch.setattr(json_provider, 'orjson', None)
+    elif json_provider.orjson is None:
+        pytest.skip('orjson nie jest zainstalowany')
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    return app
+
+
+def test_dumps_round_trip(json_app):
+    assert json_app.json.loads(json_app.json.dumps(SAMPLE)) == EXPECTED
+
+
+def test_response_round_trip(json_app):
+    with json_app.app_context():
+        response = json_app.json.response(items=[SAMPLE])
+    assert response.mimetype == 'application/json'
+    assert json.loads(response.get_data()) == {'items': [EXPECTED]}
+
+
+def seed_ledger(database, manager, count, chunk=10000):
+    # Po połowie wpisów miejsc pracy i pracowników - obie gałęzie odpowiedzi GET /api/costs
+    workplace, employee = create_workplace(manager), create_employee(manager)
+    start = datetime(2024, 1, 1)
+    for model, key, owner in ((WorkplaceCost, 'workplace_id', workplace), (EmployeeCost, 'employee_id', employee)):
+        for offset in range(0, count // 2, chunk):
+            database.session.execute(insert(model.__table__), [
+                {'id': uuid.uuid4(), key: owner.id, 'description': f'Wpis {offset + index}',
+                 'amount': (offset + index) * 1.25, 'date': start + timedelta(minutes=offset + index)}
+                for index in range(min(chunk, count // 2 - offset))
+            ])
+    database.session.commit()
+
+
+@pytest.mark.benchmark
+def test_orjson_serializes_ledger_faster_than_stdlib(app, database, manager, monkeypatch):
+    if json_provider.orjson is None:
+        pytest.skip('orjson nie jest zainstalowany')
+    rows = 50000
+    seed_ledger(database, manager, rows)
+    # Strona księgi bez limitu rozmiaru - te same wiersze i serializacja co w GET /api/costs
+    page = database.session.execute(ledger_page_query('costs', manager.id, limit=rows)).all()
+    payload = {'items': [serialize_ledger_row(row) for row in page], 'next_cursor': None}
+    assert len(payload['items']) == rows
+
+    def measure():
+        started_at = time.perf_counter()
+        body = app.json.dumps(payload)
+        return time.perf_counter() - started_at, body
+
+    fast, fast_body = measure()
+    monkeypatch.setattr(json_provider, 'orjson', None)
+    stdlib, stdlib_body = measure()
+
+    print(f'\n{rows} wierszy - json: {stdlib * 1000:.0f} ms, orjson: {fast * 1000:.0f} ms '
+          f'({stdlib / fast:.1f}x), {len(fast_body.encode()) / 1024 / 1024:.1f} MiB')
+    assert json.loads(fast_body) == json.loads(stdlib_body)
+    assert fast < stdlib
@@ -0,0 +1,48 @@
+from datetime import datetime
+import pytest
+from .factories import create_workplace, create_workplace_cost
+
+
+def bulk_patch(client, auth_headers, workplace, patch):
+    return client.patch('/api/costs/bulk', headers=auth_headers, json={
+        'filter': {'workplace_id': str(workplace.id)}, 'patch': patch
+    })
+
+
+def test_bulk_shift_moves_dates_and_rollups(client, database, manager, auth_headers):
+    workplace = create_workplace(manager)
+    create_workplace_cost(workplace, amount=40.0, date=datetime(2024, 1, 15))
+
+    response = bulk_patch(client, auth_headers, workplace, {'shift_days': 7, 'amount': 55.5})
+
+    assert response.get_json() == {'updated': 1}
+    items = client.get('/api/costs', headers=auth_headers).get_json()['items']
+    assert (items[0]['amount'], items[0]['date']) == (55.5, '2024-01-22T00:00:00')
+
+
+@pytest.mark.parametrize('patch', [
+    {'shift_days': 10 ** 12},
+    {'shift_days': -10 ** 6},
+    {'shift_days': 1.9},
+    {'shift_days': True},
+    {'shift_days': '7'},
+    {'amount': 1e300},
+    {'amount': 'nan'},
+    {'amount': 'inf'}
+])
+def test_bulk_rejects_out_of_range_patch(client, manager, auth_headers, patch):
+    workplace = create_workplace(manager)
+    create_workplace_cost(workplace)
+
+    response = bulk_patch(client, auth_headers, workplace, patch)
+
+    assert response.status_code == 400
+
+
+def test_bulk_shift_past_supported_dates_is_rejected(client, manager, auth_headers):
+    workplace = create_workplace(manager)
+    create_workplace_cost(workplace, date=datetime(9999, 6, 1))
+
+    response = bulk_patch(client, auth_headers, workplace, {'shift_days': 365})
+
+    assert response.status_code == 400
@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import insert
+from app.models import WorkplaceCost
+from .factories import create_workplace, create_workplace_cost
+
+EXPORT_PARAMS = {'dataset': 'workplace_costs', 'start_date': '2024-01-01', 'end_date': '2024-12-31'}
+
+
+def seed_costs(database, workplace, count, chunk=10000):
+    # Bezpośredni INSERT Core - eksport czyta tylko tabelę kosztów, agregaty nie są potrzebne
+    start = datetime(2024, 1, 1)
+    for offset in range(0, count, chunk):
+        database.session.execute(insert(WorkplaceCost.__table__), [
+            {
+                'id': uuid.uuid4(),
+                'workplace_id': workplace.id,
+                'description': f'Koszt {offset + index}',
+                'amount': 10.5,
+                'date': start + timedelta(minutes=offset + index)
+            }
+            for index in range(min(chunk, count - offset))
+        ])
+    database.session.commit()
+
+
+def export(client, auth_headers, export_format):
+    response = client.get('/api/reports/export', query_string={**EXPORT_PARAMS, 'format': export_format},
+                          headers=auth_headers, buffered=False)
+    assert response.status_code == 200
+    body = b''.join(response.response)
+    response.close()
+    return body.decode()
+
+
+def test_export_formats_contain_every_row(client, manager, auth_headers):
+    workplace = create_workplace(manager)
+    costs = [create_workplace_cost(workplace, amount=amount) for amount in (10.0, 20.5)]
+
+    rows = list(csv.DictReader(io.StringIO(export(client, auth_headers, 'csv'))))
+    assert {row['id'] for row in rows} == {str(cost.id) for cost in costs}
+
+    lines = [json.loads(line) for line in export(client, auth_headers, 'ndjson').splitlines()]
+    assert sorted(line['amount'] for line in lines) == [10.0, 20.5]
+    assert lines[0]['date'] == '2024-01-15T00:00:00'
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('export_format', ['csv', 'ndjson'])
+def test_export_throughput(client, database, manager, auth_headers, export_format):
+    rows = 100000
+    seed_costs(database, create_workplace(manager), rows)
+
+    started_at = time.perf_counter()
+    body = export(client, auth_headers, export_format)
+    elapsed = time.perf_counter() - started_at
+
+    exported = body.count('\n') - (1 if export_format == 'csv' else 0)
+    print(f'\n{export_format}: {rows} wierszy w {elapsed:.2f} s, {rows / elapsed:,.0f} wierszy/s')
+    assert exported == rows
+    # Próg z dużym zapasem - lokalnie ok. 45 tys. wierszy/s (CSV) i 32 tys. (NDJSON)
+    assert rows / elapsed > 10000
@@ -0,0 +1,49 @@
+import io
+import uuid
+import pytest
+from app.models import WorkplaceDailyRollup
+from .factories import create_workplace
+
+
+def upload(client, auth_headers, lines, **params):
+    content = '\n'.join(['type,workplace_id,description,amount,date', *lines]).encode()
+    return client.post('/api/costs/import', headers=auth_headers, query_string=params,
+                       data={'file': (io.BytesIO(content), 'koszty.csv')}, content_type='multipart/form-data')
+
+
+def test_import_inserts_rows_and_rollups(client, database, manager, auth_headers):
+    workplace = create_workplace(manager)
+
+    response = upload(client, auth_headers, [
+        f'workplace,{workplace.id},Czynsz,100.5,2024-01-15',
+        f'workplace,{workplace.id},Prąd,20,2024-01-15'
+    ])
+
+    assert response.status_code == 201
+    assert response.get_json()['imported'] == 2
+    assert database.session.get(WorkplaceDailyRollup, (workplace.id, '2024-01-15')).costs == 120.5
+
+
+@pytest.mark.parametrize('amount', ['nan', 'inf', '-inf', '1e400', '2e9'])
+def test_import_rejects_non_finite_and_huge_amounts(client, database, manager, auth_headers, amount):
+    workplace = create_workplace(manager)
+
+    response = upload(client, auth_headers, [
+        f'workplace,{workplace.id},Czynsz,100,2024-01-15',
+        f'workplace,{workplace.id},Błąd,{amount},2024-01-15'
+    ], skip_invalid='true')
+
+    body = response.get_json()
+    assert response.status_code == 201
+    assert (body['imported'], [error['row'] for error in body['errors']]) == (1, [3])
+    assert database.session.get(WorkplaceDailyRollup, (workplace.id, '2024-01-15')).costs == 100
+
+
+def test_import_database_error_is_a_clean_400(client, manager, auth_headers, monkeypatch):
+    # Miejsce pracy usunięte między sprawdzeniem przynależności a zapisem - naruszenie klucza obcego
+    monkeypatch.setattr('app.services.ledger_import.OwnershipResolver.owns', lambda self, entry_type, entity_id: True)
+
+    response = upload(client, auth_headers, [f'workplace,{uuid.uuid4()},Czynsz,100,2024-01-15'])
+
+    assert response.status_code == 400
+    assert 'import' in response.get_json()['error']
@@ -0,0 +1,67 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import text
+from app.services.aggregates import (
+    employee_report_query, employee_totals_query, workplace_report_query, workplace_totals_query
+)
+from app.services.ledger import ledger_page_query
+from .test_report_queries import seed_entities
+
+START, END = datetime(2024, 1, 1), datetime(2024, 1, 31)
+
+# Zapytanie -> indeksy, z których musi korzystać plan
+EXPECTED_INDEXES = {
+    'employee_totals': (
+        lambda manager_id: employee_totals_query(manager_id, START, END),
+        {'employee_daily_rollups_pkey'}
+    ),
+    'workplace_totals': (
+        lambda manager_id: workplace_totals_query(manager_id, START, END),
+        {'workplace_daily_rollups_pkey'}
+    ),
+    'employee_report': (
+        lambda manager_id: employee_report_query(manager_id, START, END),
+        {'employee_daily_rollups_pkey', 'ix_schedules_employee_id_date'}
+    ),
+    'workplace_report': (
+        lambda manager_id: workplace_report_query(manager_id, START, END),
+        {'workplace_daily_rollups_pkey', 'ix_schedules_workplace_id_date'}
+    ),
+    'costs_page': (
+        lambda manager_id: ledger_page_query('costs', manager_id),
+        {'ix_workplace_costs_workplace_id_date', 'ix_employee_costs_employee_id_date'}
+    ),
+    'revenues_page': (
+        lambda manager_id: ledger_page_query('revenues', manager_id),
+        {'ix_workplace_revenues_workplace_id_date', 'ix_employee_revenues_employee_id_date'}
+    )
+}
+
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get('Plans', ()):
+        yield from plan_nodes(child)
+
+
+def explain(database, stmt):
+    connection = database.session.connection()
+    compiled = stmt.compile(dialect=connection.dialect)
+    # Na małej bazie testowej planista i tak wybrałby skan sekwencyjny - wyłączamy go,
+    # by sprawdzić, czy indeksy pasują do warunków i sortowania zapytań
+    connection.execute(text('SET LOCAL enable_seqscan = off'))
+    plan = connection.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {compiled}', compiled.params).scalar()
+    return list(plan_nodes(plan[0]['Plan']))
+
+
+@pytest.mark.parametrize('name', EXPECTED_INDEXES)
+def test_query_uses_indexes(database, manager, name):
+    build, expected = EXPECTED_INDEXES[name]
+    seed_entities(manager, 3)
+    database.session.execute(text('ANALYZE'))
+
+    nodes = explain(database, build(manager.id))
+
+    assert expected <= {node['Index Name'] for node in nodes if 'Index Name' in node}
+    assert not [node for node in nodes if node['Node Type'] == 'Seq Scan']
+
@@ -0,0 +1,18 @@
+from flask_jwt_extended import create_access_token
+from .factories import create_user
+
+
+def test_cache_stats_hidden_from_managers(client, manager, auth_headers):
+    response = client.get('/api/reports/cache', headers=auth_headers)
+
+    assert response.status_code == 403
+
+
+def test_cache_stats_for_admin(client, database):
+    admin = create_user(role='admin')
+    headers = {'Authorization': f'Bearer {create_access_token(identity=str(admin.id))}'}
+
+    response = client.get('/api/reports/cache', headers=headers)
+
+    assert response.status_code == 200
+    assert set(response.get_json()) == {'hits', 'misses', 'hit_ratio', 'size', 'maxsize'}
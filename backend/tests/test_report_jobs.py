@@ -0,0 +1,35 @@
+import time
+import pytest
+from flask import Flask
+from app.services.report_jobs import ReportJobQueue
+
+
+def wait_for(job, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not job.finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+def test_queue_starts_workers_on_first_job(tmp_path):
+    app = Flask(__name__)
+    app.config['REPORT_JOB_DIR'] = str(tmp_path / 'jobs')
+    queue = ReportJobQueue(app)
+
+    assert queue.executor is None
+    assert not (tmp_path / 'jobs').exists()
+
+    job = wait_for(queue.submit('manager', 'stats', lambda manager_id: {'ok': manager_id}, {}))
+
+    assert queue.executor is not None
+    assert (tmp_path / 'jobs').is_dir()
+    assert job.status == 'done'
+    assert job.result == {'ok': 'manager'}
+    queue.executor.shutdown()
+
+
+@pytest.mark.parametrize('body', ['null', '[]', '"excel"'])
+def test_create_job_rejects_non_object_body(client, auth_headers, body):
+    response = client.post('/api/reports/jobs', data=body, content_type='application/json', headers=auth_headers)
+
+    assert response.status_code == 400
@@ -0,0 +1,34 @@
+from app.services.aggregates import employee_totals_query
+from app.services.report_pipeline import report_sections, run_sections
+from .factories import create_employee
+
+
+def test_section_queue_is_bounded(app, database, manager, monkeypatch):
+    for _ in range(30):
+        create_employee(manager)
+    monkeypatch.setitem(app.config, 'REPORT_SECTION_QUEUE_SIZE', 5)
+
+    stream, = run_sections([employee_totals_query(manager.id, '2024-01-01', '2024-01-31')])
+    rows = iter(stream)
+    next(rows)
+    # Producent czeka na odbiorcę zamiast wczytać całą sekcję do kolejki
+    assert not stream.finished.wait(0.5)
+    assert stream.queue.qsize() <= 5
+
+    assert len(list(rows)) == 29
+    assert stream.finished.wait(5)
+
+
+def test_abandoned_sections_release_their_producers(app, database, manager, monkeypatch):
+    for _ in range(30):
+        create_employee(manager)
+    monkeypatch.setitem(app.config, 'REPORT_SECTION_QUEUE_SIZE', 5)
+
+    statements = [employee_totals_query(manager.id, '2024-01-01', '2024-01-31') for _ in range(2)]
+    with report_sections(statements) as sections:
+        first = next(sections)
+        next(iter(first))
+        streams = [first, next(sections)]
+
+    # Po wyjściu z bloku producenci kończą pracę i oddają połączenia do puli
+    assert all(stream.finished.wait(5) for stream in streams)
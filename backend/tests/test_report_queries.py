@@ -0,0 +1,58 @@
+from datetime import date, datetime
+from app import report_cache
+from .factories import (
+    create_employee, create_employee_cost, create_employee_revenue, create_schedule, create_workplace,
+    create_workplace_cost, create_workplace_revenue
+)
+from .helpers import count_queries
+
+STATS_PAYLOAD = {'start_date': '2024-01-01T00:00:00', 'end_date': '2024-01-31T23:59:59', 'type': 'all'}
+
+
+def seed_entities(manager, count):
+    for _ in range(count):
+        workplace = create_workplace(manager)
+        employee = create_employee(manager)
+        create_workplace_cost(workplace, amount=40.0, date=datetime(2024, 1, 10))
+        create_workplace_revenue(workplace, amount=90.0, date=datetime(2024, 1, 11))
+        create_employee_cost(employee, amount=25.0, date=datetime(2024, 1, 12))
+        create_employee_revenue(employee, amount=60.0, date=datetime(2024, 1, 13))
+        create_schedule(workplace, employee, date=date(2024, 1, 14), hours=6.0)
+
+
+def stats_query_count(client, database, auth_headers):
+    report_cache.entries.clear()
+    with count_queries(database.engine) as statements:
+        response = client.post('/api/reports/stats', json=STATS_PAYLOAD, headers=auth_headers)
+    assert response.status_code == 200
+    return len(statements), response.get_json()
+
+
+def test_stats_returns_totals_for_every_entity(client, database, manager, auth_headers):
+    seed_entities(manager, 3)
+    # Pracownik bez aktywności również trafia do raportu
+    create_employee(manager)
+
+    _, stats = stats_query_count(client, database, auth_headers)
+
+    assert len(stats['employees']) == 4
+    assert len(stats['workplaces']) == 3
+    active = [row for row in stats['employees'] if row['total_hours']]
+    assert len(active) == 3
+    assert all(row['total_costs'] == 25.0 and row['total_revenues'] == 60.0 for row in active)
+    assert all(row['total_profit'] == 35.0 and row['total_hours'] == 6.0 for row in active)
+    assert all(row['total_profit'] == 50.0 for row in stats['workplaces'])
+
+
+def test_stats_query_count_does_not_grow_with_headcount(client, database, manager, auth_headers):
+    seed_entities(manager, 2)
+    small, _ = stats_query_count(client, database, auth_headers)
+
+    seed_entities(manager, 40)
+    large, stats = stats_query_count(client, database, auth_headers)
+
+    assert len(stats['employees']) == 42
+    assert len(stats['workplaces']) == 42
+    # Jedno zapytanie GROUP BY na sekcję niezależnie od liczby pracowników i miejsc pracy
+    assert large == small
+    assert large <= 4
@@ -0,0 +1,112 @@
+import threading
+import uuid
+from datetime import date
+import pytest
+from sqlalchemy import func, insert, select
+from app.models import EmployeeDailyRollup, Schedule
+from app.services import rollups
+from .factories import create_employee, create_workplace
+
+DAY = date(2024, 1, 15)
+
+
+def schedule_entry(workplace, employee, hours):
+    return {'workplace_id': str(workplace.id), 'employee_id': str(employee.id), 'date': '2024-01-15', 'hours': hours}
+
+
+@pytest.mark.parametrize('atomic', ['false', 0, None])
+def test_bulk_rejects_non_boolean_atomic(client, manager, auth_headers, atomic):
+    workplace, employee = create_workplace(manager), create_employee(manager)
+
+    response = client.post('/api/schedules/bulk', headers=auth_headers, json={
+        'entries': [schedule_entry(workplace, employee, 8)], 'atomic': atomic
+    })
+
+    assert response.status_code == 400
+    assert 'atomic' in response.get_json()['error']
+
+
+def test_bulk_partial_mode_keeps_valid_entries(client, manager, auth_headers):
+    workplace, employee = create_workplace(manager), create_employee(manager)
+
+    response = client.post('/api/schedules/bulk', headers=auth_headers, json={
+        'entries': [schedule_entry(workplace, employee, 8), schedule_entry(workplace, employee, 20)],
+        'atomic': False
+    })
+
+    body = response.get_json()
+    assert response.status_code == 201
+    assert len(body['created']) == 1
+    assert [error['index'] for error in body['errors']] == [1]
+
+
+def day_hours(database, employee):
+    scheduled = database.session.execute(
+        select(func.coalesce(func.sum(Schedule.hours), 0)).where(Schedule.employee_id == employee.id)
+    ).scalar()
+    rollup = database.session.get(EmployeeDailyRollup, (employee.id, DAY))
+    database.session.commit()
+    return scheduled, rollup
+
+
+def test_concurrent_writers_cannot_exceed_daily_cap(client, database, manager, auth_headers, monkeypatch):
+    workplace, employee = create_workplace(manager), create_employee(manager)
+    # Bez wstępnego odczytu sumy godzin wszyscy piszący dochodzą do bazy - limit musi utrzymać ograniczenie
+    monkeypatch.setattr('app.routes.schedules.daily_hours', lambda employee_id, day: 0.0)
+    payload = schedule_entry(workplace, employee, 3)
+    writers = 12
+    barrier = threading.Barrier(writers)
+    statuses = []
+
+    def write():
+        # Każdy wątek to osobne żądanie z własną sesją i połączeniem z bazą
+        writer = client.application.test_client()
+        barrier.wait()
+        response = writer.post('/api/schedules', json=payload, headers=auth_headers)
+        statuses.append((response.status_code, response.get_json()))
+
+    threads = [threading.Thread(target=write) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    created = [body for status, body in statuses if status == 201]
+    rejected = [body for status, body in statuses if status != 201]
+    scheduled, rollup = day_hours(database, employee)
+    assert len(created) == 8
+    assert all(status == 400 and '24' in body['error'] for status, body in statuses if status != 201)
+    assert len(rejected) == writers - 8
+    assert scheduled == rollup.hours == 24
+
+
+def test_legacy_over_cap_day_still_accepts_ledger_writes(client, database, manager, auth_headers):
+    workplace, employee = create_workplace(manager), create_employee(manager)
+    # Grafik sprzed wprowadzenia limitu - zapis Core z pominięciem agregatów, potem pełne przeliczenie
+    database.session.execute(insert(Schedule.__table__), [
+        {'id': uuid.uuid4(), 'workplace_id': workplace.id, 'employee_id': employee.id, 'date': DAY, 'hours': 16.0}
+        for _ in range(2)
+    ])
+    rollups.rebuild(database.session.connection())
+    database.session.commit()
+
+    cost = client.post('/api/costs', headers=auth_headers, json={
+        'type': 'employee', 'employee_id': str(employee.id), 'description': 'Delegacja',
+        'amount': 50.0, 'date': '2024-01-15T00:00:00'
+    })
+    schedule = client.post('/api/schedules', json=schedule_entry(workplace, employee, 1), headers=auth_headers)
+
+    assert cost.status_code == 201
+    assert schedule.status_code == 400
+    _, rollup = day_hours(database, employee)
+    assert (rollup.hours, rollup.legacy_hours, rollup.costs) == (32.0, 32.0, 50.0)
+
+
+@pytest.mark.parametrize('employee_id', [123, ['id'], {'id': 1}, 'nie-uuid'])
+def test_clone_rejects_malformed_ids(client, manager, auth_headers, employee_id):
+    response = client.post('/api/schedules/clone', headers=auth_headers, json={
+        'source_start': '2024-01-01', 'source_end': '2024-01-07', 'target_start': '2024-01-08',
+        'employee_id': employee_id
+    })
+
+    assert response.status_code == 400
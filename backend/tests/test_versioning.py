@@ -0,0 +1,66 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from app.services.versioning import data_version
+from .factories import create_workplace, create_workplace_cost
+
+
+@contextmanager
+def count_commits(engine):
+    commits = []
+    listener = lambda connection: commits.append(connection)
+    event.listen(engine, 'commit', listener)
+    try:
+        yield commits
+    finally:
+        event.remove(engine, 'commit', listener)
+
+
+def cost_payload(workplace):
+    return {
+        'type': 'workplace', 'workplace_id': str(workplace.id), 'description': 'Prąd',
+        'amount': 120.0, 'date': '2024-01-15T00:00:00'
+    }
+
+
+def test_write_bumps_version_in_its_own_transaction(client, database, manager, auth_headers):
+    workplace = create_workplace(manager)
+
+    with count_commits(database.engine) as commits:
+        response = client.post('/api/costs', json=cost_payload(workplace), headers=auth_headers)
+
+    assert response.status_code == 201
+    assert len(commits) == 1
+    assert data_version(manager.id) == 1
+
+
+def test_failed_write_keeps_version(client, database, manager, auth_headers):
+    workplace = create_workplace(manager)
+    payload = {**cost_payload(workplace), 'date': 'nie-data'}
+
+    response = client.post('/api/costs', json=payload, headers=auth_headers)
+
+    assert response.status_code == 400
+    assert data_version(manager.id) == 0
+
+
+def test_core_bulk_write_bumps_version(client, database, manager, auth_headers):
+    workplace = create_workplace(manager)
+    create_workplace_cost(workplace)
+
+    response = client.delete('/api/costs/bulk', json={'filter': {'workplace_id': str(workplace.id)}},
+                             headers=auth_headers)
+
+    assert response.get_json() == {'deleted': 1}
+    assert data_version(manager.id) == 1
+
+
+def test_batch_bumps_version_once(client, database, manager, auth_headers):
+    workplace = create_workplace(manager)
+    requests = [{'method': 'POST', 'path': '/api/costs', 'body': cost_payload(workplace)} for _ in range(3)]
+
+    with count_commits(database.engine) as commits:
+        response = client.post('/api/batch', json={'requests': requests}, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert len(commits) == 1
+    assert data_version(manager.id) == 1
@@ -64,6 +64,11 @@ interface Cost {
   created_at: string;
 }
 
+interface CostPage {
+  items: Cost[];
+  next_cursor: string | null;
+}
+
 interface CostFormData {
   type: string;
   workplace_id: string;
@@ -101,8 +106,16 @@ export const CostList: React.FC = () => {
 
   const fetchCosts = async () => {
     try {
-      const response = await axios.get<Cost[]>('/api/costs');
-      setCosts(response.data);
+      const items: Cost[] = [];
+      let cursor: string | null = null;
+      do {
+        const response: { data: CostPage } = await axios.get<CostPage>('/api/costs', {
+          params: { after: cursor ?? undefined, limit: 500 },
+        });
+        items.push(...response.data.items);
+        cursor = response.data.next_cursor;
+      } while (cursor);
+      setCosts(items);
       setError(null);
     } catch (err) {
       setError('Nie udało się pobrać listy kosztów');
@@ -114,7 +127,7 @@ export const CostList: React.FC = () => {
 
   const fetchWorkplaces = async () => {
     try {
-      const response = await axios.get('/api/workplaces');
+      const response = await axios.get('/api/workplaces', { params: { fields: 'id,name' } });
       setWorkplaces(response.data);
     } catch (err) {
       setError('Nie udało się pobrać listy miejsc pracy');
@@ -124,7 +137,7 @@ export const CostList: React.FC = () => {
 
   const fetchEmployees = async () => {
     try {
-      const response = await axios.get('/api/employees');
+      const response = await axios.get('/api/employees', { params: { fields: 'id,first_name,last_name' } });
       const mappedEmployees = response.data.map((emp: any) => ({
         id: emp.id,
         firstName: emp.first_name,
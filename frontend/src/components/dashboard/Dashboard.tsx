@@ -82,8 +82,8 @@ export const Dashboard: React.FC = () => {
         const [employeesRes, workplacesRes, costsRes, revenuesRes] = await Promise.all([
           axios.get('/api/employees'),
           axios.get('/api/workplaces'),
-          axios.get('/api/costs'),
-          axios.get('/api/revenues')
+          axios.get('/api/costs', { params: { limit: 5 } }),
+          axios.get('/api/revenues', { params: { limit: 5 } })
         ]);
         
         // Mapowanie danych z backendu
@@ -99,8 +99,9 @@ export const Dashboard: React.FC = () => {
         
         setEmployees(mappedEmployees);
         setWorkplaces(workplacesRes.data);
-        setCosts(costsRes.data);
-        setRevenues(revenuesRes.data);
+        // Księgi zwracają stronę {items, next_cursor} - pulpit pokazuje tylko najnowsze wpisy
+        setCosts(costsRes.data.items);
+        setRevenues(revenuesRes.data.items);
         setError(null);
       } catch (error) {
         console.error('Błąd podczas pobierania danych:', error);
@@ -66,6 +66,11 @@ interface Revenue {
   created_at: string;
 }
 
+interface RevenuePage {
+  items: Revenue[];
+  next_cursor: string | null;
+}
+
 interface RevenueFormData {
   type: 'workplace' | 'employee';
   workplace_id: string;
@@ -111,8 +116,16 @@ export const RevenueList: React.FC = () => {
 
   const fetchRevenues = async () => {
     try {
-      const response = await axios.get<Revenue[]>('/api/revenues');
-      setRevenues(response.data);
+      const items: Revenue[] = [];
+      let cursor: string | null = null;
+      do {
+        const response: { data: RevenuePage } = await axios.get<RevenuePage>('/api/revenues', {
+          params: { after: cursor ?? undefined, limit: 500 },
+        });
+        items.push(...response.data.items);
+        cursor = response.data.next_cursor;
+      } while (cursor);
+      setRevenues(items);
       setError(null);
     } catch (err) {
       setError('Nie udało się pobrać listy przychodów');
@@ -124,7 +137,7 @@ export const RevenueList: React.FC = () => {
 
   const fetchWorkplaces = async () => {
     try {
-      const response = await axios.get('/api/workplaces');
+      const response = await axios.get('/api/workplaces', { params: { fields: 'id,name' } });
       setWorkplaces(response.data);
     } catch (err) {
       console.error('Error fetching workplaces:', err);
@@ -133,7 +146,7 @@ export const RevenueList: React.FC = () => {
 
   const fetchEmployees = async () => {
     try {
-      const response = await axios.get('/api/employees');
+      const response = await axios.get('/api/employees', { params: { fields: 'id,first_name,last_name' } });
       const mappedEmployees = response.data.map((emp: any) => ({
         id: emp.id,
         firstName: emp.first_name,
@@ -48,6 +48,11 @@ interface Schedule {
   created_at: string;
 }
 
+interface SchedulePage {
+  items: Schedule[];
+  next_cursor: string | null;
+}
+
 interface ScheduleFormData {
   workplace_id: string;
   employee_id: string;
@@ -108,8 +113,16 @@ export const ScheduleList: React.FC = () => {
 
   const fetchSchedules = async () => {
     try {
-      const response = await axios.get('/api/schedules');
-      setSchedules(response.data);
+      const items: Schedule[] = [];
+      let cursor: string | null = null;
+      do {
+        const response: { data: SchedulePage } = await axios.get<SchedulePage>('/api/schedules', {
+          params: { after: cursor ?? undefined, limit: 500 },
+        });
+        items.push(...response.data.items);
+        cursor = response.data.next_cursor;
+      } while (cursor);
+      setSchedules(items);
       setLoading(false);
     } catch (error) {
       console.error('Błąd podczas pobierania grafików:', error);
@@ -120,7 +133,7 @@ export const ScheduleList: React.FC = () => {
 
   const fetchWorkplaces = async () => {
     try {
-      const response = await axios.get('/api/workplaces');
+      const response = await axios.get('/api/workplaces', { params: { fields: 'id,name' } });
       setWorkplaces(response.data);
     } catch (error) {
       console.error('Błąd podczas pobierania miejsc pracy:', error);
@@ -129,7 +142,7 @@ export const ScheduleList: React.FC = () => {
 
   const fetchEmployees = async () => {
     try {
-      const response = await axios.get('/api/employees');
+      const response = await axios.get('/api/employees', { params: { fields: 'id,first_name,last_name' } });
       setEmployees(response.data);
     } catch (error) {
       console.error('Błąd podczas pobierania pracowników:', error);